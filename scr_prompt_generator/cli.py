@@ -108,10 +108,12 @@ EXEMPLES D'UTILISATION:
     export_parser = subparsers.add_parser('export', help='Exporter la base de connaissances')
     export_parser.add_argument('--output', required=True, help='Fichier de sortie')
     export_parser.add_argument('--format', choices=['json', 'csv', 'yaml'], default='json', help='Format')
+    export_parser.add_argument('--pretty', action='store_true', help='JSON indenté (lisible)')
 
     # Commande: health
     health_parser = subparsers.add_parser('health', help='Vérifier la santé du système')
     health_parser.add_argument('--fix', action='store_true', help='Tenter de corriger les problèmes')
+    health_parser.add_argument('--deep', action='store_true', help='Inclure le test de génération de prompt')
 
     # Commande: init
     init_parser = subparsers.add_parser('init', help='Initialiser un nouveau projet')
@@ -514,12 +516,10 @@ def handle_search(args):
                 query=args.query,
                 scr_modules=scr_modules,
                 doc_types=doc_types,
-                min_reliability=args.min_reliability
+                min_reliability=args.min_reliability,
+                limit=args.limit
             )
 
-            # Limitation des résultats
-            results = results[:args.limit]
-
             print(f"🔍 RÉSULTATS DE RECHERCHE")
             print("=" * 40)
 
@@ -551,7 +551,7 @@ def handle_export(args):
         with SCRPromptGenerator(args.data_dir, args.db_path) as generator:
             print(f"📤 Export en cours vers {args.output}...")
 
-            success = generator.export_knowledge_base(args.output, args.format)
+            success = generator.export_knowledge_base(args.output, args.format, pretty=args.pretty)
 
             if success:
                 print(f"✅ Export réussi: {args.output}")
@@ -578,7 +578,7 @@ def handle_health(args):
             print("🏥 DIAGNOSTIC DE SANTÉ DU SYSTÈME")
             print("=" * 40)
 
-            health = generator.validate_system_health()
+            health = generator.validate_system_health(deep=args.deep)
 
             # Statut global
             status_emoji = {
@@ -624,7 +624,7 @@ def handle_health(args):
                 print("✅ Répertoires créés/vérifiés")
 
                 # Nouvelle vérification
-                health_after = generator.validate_system_health()
+                health_after = generator.validate_system_health(deep=args.deep, use_cache=False)
                 if health_after['overall_status'] != health['overall_status']:
                     print(f"✅ Amélioration: {health_after['overall_status']}")
                 else:
@@ -3,6 +3,7 @@
 # Fichier: src/config/settings.py
 # ==========================================
 
+import sys
 from enum import Enum
 from dataclasses import dataclass
 from typing import List, Optional, Dict, Any
@@ -28,11 +29,22 @@ class Config:
     # Paramètres de parsing
     MAX_FILE_SIZE_MB = 100
     SUPPORTED_LANGUAGES = ["fr", "en"]
+    PARSER_CACHE_ENABLED = True
+    PARSER_CACHE_FILENAME = "parser_cache.db"  # Relatif au répertoire de données
+    HTML_STREAMING_THRESHOLD_MB = 1  # Au-delà, fichiers HTML lus en flux (lxml.etree.iterparse)
+    MEMORY_DB_SNAPSHOT_SECONDS = 300  # Base en mémoire : intervalle minimal entre deux copies sur disque
+
+    # Export : écritures vectorisées os.writev (POSIX) au lieu d'un fichier tamponné
+    EXPORT_VECTORED_WRITES = False
+
+    # Diagnostic de santé
+    HEALTH_CHECK_TTL_SECONDS = 60
 
     # IA et prompts
     DEFAULT_AI_PROVIDER = "claude-sonnet-4"
     DEFAULT_EXPERTISE_LEVEL = "expert"
     DEFAULT_MAX_PROMPT_LENGTH = 3000
+    PROMPT_CACHE_TTL_SECONDS = 3600  # Durée de vie des prompts rendus en cache
 
 
 # Énumérations
@@ -67,6 +79,23 @@ class SCRModule(Enum):
     NON_LIFE = "non_life"
 
 
+# Noms français des modules SCR (attribut du membre : pas de recherche dans un dict)
+for _module, _fr_name in (
+    (SCRModule.SPREAD, "SCR de spread (risque de crédit)"),
+    (SCRModule.INTEREST_RATE, "SCR de taux d'intérêt"),
+    (SCRModule.EQUITY, "SCR actions"),
+    (SCRModule.CURRENCY, "SCR de change"),
+    (SCRModule.CONCENTRATION, "SCR de concentration"),
+    (SCRModule.MARKET_GLOBAL, "SCR de marché global"),
+    (SCRModule.COUNTERPARTY, "SCR de contrepartie"),
+    (SCRModule.OPERATIONAL, "SCR opérationnel"),
+    (SCRModule.LIFE, "SCR vie"),
+    (SCRModule.NON_LIFE, "SCR non-vie"),
+):
+    _module.fr_name = sys.intern(_fr_name)
+del _module, _fr_name
+
+
 class DocumentType(Enum):
     """Types de documents sources"""
     REGULATION_EU = "regulation_eu"
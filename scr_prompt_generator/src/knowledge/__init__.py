@@ -6,10 +6,11 @@
 Knowledge management package
 """
 
-from .models import DocumentSource, SCRConcept, PromptConfig
+from .models import DocumentSource, SCRConcept, PromptConfig, ModuleBundle
 
 __all__ = [
     'DocumentSource',
     'SCRConcept',
-    'PromptConfig'
+    'PromptConfig',
+    'ModuleBundle'
 ]
\ No newline at end of file
@@ -5,34 +5,85 @@
 
 import sqlite3
 import json
+import time
 import logging
+from contextlib import contextmanager, closing
 from datetime import datetime, date
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Iterator
 from pathlib import Path
 
-from .models import DocumentSource, SCRConcept
+from .models import DocumentSource, SCRConcept, ModuleBundle
 from ..config import Config, DocumentType, SCRModule
 
 
+# Requêtes d'insertion partagées par les ajouts unitaires et groupés
+_INSERT_DOCUMENT_SQL = """
+    INSERT OR REPLACE INTO documents 
+    (id, title, doc_type, url, file_path, publication_date, 
+     regulatory_articles, scr_modules, language, reliability_score, 
+     content_hash, last_updated, search_lc)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_INSERT_CONCEPT_SQL = """
+    INSERT INTO scr_concepts 
+    (concept_name, scr_module, definition, formula, regulatory_article, 
+     source_document_id, examples, created_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+def _search_text(title: str, regulatory_articles: List[str]) -> str:
+    """
+    Texte de recherche d'un document (colonne search_lc) : titre et articles en minuscules
+
+    str.lower() traite les accents, contrairement à LIKE qui ne replie que l'ASCII.
+    """
+    return f"{title} {' '.join(regulatory_articles)}".lower()
+
+
 class SCRKnowledgeBase:
     """Base de connaissances centralisée pour concepts SCR"""
 
-    def __init__(self, db_path: str = None):
+    def __init__(self, db_path: str = None, in_memory: bool = False):
         """
         Initialisation de la base de données
 
         Args:
             db_path: Chemin vers la base SQLite (optionnel)
+            in_memory: Travailler sur une copie en mémoire de la base, recopiée sur
+                disque par flush(), à la fermeture et au plus toutes les
+                Config.MEMORY_DB_SNAPSHOT_SECONDS après une écriture
         """
         self.db_path = db_path or Config.DEFAULT_DB_PATH
+        self.in_memory = in_memory
         self.logger = logging.getLogger(__name__)
 
         # Créer le répertoire si nécessaire
         Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
 
         # Connexion à la base
-        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        if in_memory:
+            self.conn = sqlite3.connect(":memory:", check_same_thread=False)
+            with closing(sqlite3.connect(self.db_path)) as disk_conn:
+                disk_conn.backup(self.conn)
+        else:
+            self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
         self.conn.row_factory = sqlite3.Row  # Pour accès par nom de colonne
+        self._last_snapshot = time.monotonic()
+
+        # WAL : les lectures ne bloquent pas les écritures, et en mode NORMAL
+        # une transaction validée ne coûte pas de fsync (seuls les checkpoints)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA temp_store=MEMORY")
+        self.conn.execute("PRAGMA cache_size=-65536")  # Cache de pages : 64 MB (valeur négative = KiB)
+
+        # Profondeur des blocs batch() imbriqués (validation différée si > 0)
+        self._batch_depth = 0
+
+        # Compteur de modifications, incrémenté à chaque écriture (invalidation des caches)
+        self.version = 0
 
         # Initialisation des tables
         self._initialize_database()
@@ -58,10 +109,24 @@ class SCRKnowledgeBase:
                 reliability_score REAL DEFAULT 0.8,
                 content_hash TEXT,
                 last_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                search_lc TEXT  -- Titre et articles en minuscules (recherche)
             )
         """)
 
+        # Base antérieure à la colonne search_lc : ajout puis remplissage
+        cursor.execute("SELECT 1 FROM pragma_table_info('documents') WHERE name = 'search_lc'")
+        if cursor.fetchone() is None:
+            cursor.execute("ALTER TABLE documents ADD COLUMN search_lc TEXT")
+            cursor.execute("SELECT id, title, regulatory_articles FROM documents")
+            cursor.executemany(
+                "UPDATE documents SET search_lc = ? WHERE id = ?",
+                [
+                    (_search_text(row['title'], json.loads(row['regulatory_articles'] or '[]')), row['id'])
+                    for row in cursor.fetchall()
+                ]
+            )
+
         # Table des concepts SCR
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS scr_concepts (
@@ -104,9 +169,121 @@ class SCRKnowledgeBase:
             ON scr_concepts(scr_module)
         """)
 
+        # Modules des documents, une ligne par couple (module, document) : la liste JSON
+        # documents.scr_modules ne peut être filtrée que par LIKE '%...%' (parcours complet)
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'document_modules'")
+        backfill = cursor.fetchone() is None
+
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS document_modules (
+                scr_module TEXT NOT NULL,
+                document_id TEXT NOT NULL,
+                PRIMARY KEY (scr_module, document_id)
+            ) WITHOUT ROWID
+        """)
+
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_document_modules_document
+            ON document_modules(document_id)
+        """)
+
+        # Tenue à jour par la base elle-même (INSERT OR REPLACE, executemany, DELETE...)
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS trg_documents_modules_insert
+            AFTER INSERT ON documents
+            BEGIN
+                DELETE FROM document_modules WHERE document_id = NEW.id;
+                INSERT OR IGNORE INTO document_modules (scr_module, document_id)
+                SELECT value, NEW.id FROM json_each(NEW.scr_modules);
+            END
+        """)
+
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS trg_documents_modules_update
+            AFTER UPDATE OF id, scr_modules ON documents
+            BEGIN
+                DELETE FROM document_modules WHERE document_id = OLD.id;
+                INSERT OR IGNORE INTO document_modules (scr_module, document_id)
+                SELECT value, NEW.id FROM json_each(NEW.scr_modules);
+            END
+        """)
+
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS trg_documents_modules_delete
+            AFTER DELETE ON documents
+            BEGIN
+                DELETE FROM document_modules WHERE document_id = OLD.id;
+            END
+        """)
+
+        # Base antérieure à la table : remplissage à partir des documents existants
+        if backfill:
+            cursor.execute("""
+                INSERT OR IGNORE INTO document_modules (scr_module, document_id)
+                SELECT modules.value, documents.id
+                FROM documents, json_each(documents.scr_modules) AS modules
+            """)
+
         self.conn.commit()
         self.logger.debug("Tables de base de données créées/vérifiées")
 
+    @contextmanager
+    def batch(self):
+        """
+        Regroupement des écritures du bloc en une seule transaction
+
+        Les méthodes d'écriture appelées dans le bloc ne valident plus : la transaction
+        est validée à la sortie du bloc, ou annulée si une exception en sort. Les blocs
+        imbriqués rejoignent la transaction du bloc extérieur.
+
+        Usage:
+            with kb.batch():
+                kb.add_document(doc)
+                kb.add_scr_concept(concept)
+        """
+        if self._batch_depth == 0 and not self.conn.in_transaction:
+            self.conn.execute("BEGIN IMMEDIATE")
+        self._batch_depth += 1
+
+        try:
+            yield self
+        except BaseException:
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                self.conn.rollback()
+            raise
+
+        self._batch_depth -= 1
+        if self._batch_depth == 0:
+            self.conn.commit()
+            self._maybe_snapshot()
+
+    def _begin(self):
+        """Début d'une écriture : point de sauvegarde dans un bloc batch() (sinon rien)"""
+        if self._batch_depth:
+            self.conn.execute("SAVEPOINT kb_write")
+
+    def _commit(self):
+        """Fin d'une écriture réussie : validation, ou dans un bloc batch() libération du point de sauvegarde"""
+        if self._batch_depth:
+            self.conn.execute("RELEASE kb_write")
+        else:
+            self.conn.commit()
+            self._maybe_snapshot()
+
+    def _rollback(self):
+        """
+        Annulation d'une écriture en échec
+
+        Dans un bloc batch(), seule cette écriture est annulée (retour au point de
+        sauvegarde) : les écritures précédentes du bloc sont conservées.
+        """
+        if self._batch_depth:
+            self.conn.execute("ROLLBACK TO kb_write")
+            self.conn.execute("RELEASE kb_write")
+        else:
+            self.conn.rollback()
+
     def add_document(self, doc_source: DocumentSource) -> bool:
         """
         Ajout d'un document à la base
@@ -118,45 +295,73 @@ class SCRKnowledgeBase:
             True si succès, False sinon
         """
         try:
+            self._begin()
             cursor = self.conn.cursor()
+            cursor.execute(_INSERT_DOCUMENT_SQL, self._document_row(doc_source))
 
-            # Sérialisation des listes en JSON
-            regulatory_articles_json = json.dumps(doc_source.regulatory_articles)
-            scr_modules_json = json.dumps([m.value for m in doc_source.scr_modules])
+            self._commit()
+            self.version += 1
+            self.logger.info(f"Document ajouté: {doc_source.id}")
+            return True
 
-            # Conversion de la date
-            pub_date = doc_source.publication_date.isoformat() if doc_source.publication_date else None
+        except Exception as e:
+            self.logger.error(f"Erreur ajout document {doc_source.id}: {e}")
+            self._rollback()
+            return False
 
-            cursor.execute("""
-                INSERT OR REPLACE INTO documents 
-                (id, title, doc_type, url, file_path, publication_date, 
-                 regulatory_articles, scr_modules, language, reliability_score, 
-                 content_hash, last_updated)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                doc_source.id,
-                doc_source.title,
-                doc_source.doc_type.value,
-                doc_source.url,
-                doc_source.file_path,
-                pub_date,
-                regulatory_articles_json,
-                scr_modules_json,
-                doc_source.language,
-                doc_source.reliability_score,
-                doc_source.content_hash,
-                doc_source.last_updated.isoformat()
-            ))
+    def add_documents(self, doc_sources: List[DocumentSource]) -> bool:
+        """
+        Ajout de plusieurs documents en une seule transaction
 
-            self.conn.commit()
-            self.logger.info(f"Document ajouté: {doc_source.id}")
+        Args:
+            doc_sources: DocumentSource à ajouter
+
+        Returns:
+            True si tous les documents sont enregistrés, False sinon (aucun n'est conservé)
+        """
+        if not doc_sources:
+            return True
+
+        try:
+            self._begin()
+            self.conn.executemany(_INSERT_DOCUMENT_SQL, [self._document_row(doc) for doc in doc_sources])
+
+            self._commit()
+            self.version += 1
+            self.logger.info(f"{len(doc_sources)} documents ajoutés")
             return True
 
         except Exception as e:
-            self.logger.error(f"Erreur ajout document {doc_source.id}: {e}")
-            self.conn.rollback()
+            self.logger.error(f"Erreur ajout groupé de {len(doc_sources)} documents: {e}")
+            self._rollback()
             return False
 
+    @staticmethod
+    def _document_row(doc_source: DocumentSource) -> tuple:
+        """Paramètres de _INSERT_DOCUMENT_SQL pour un document"""
+        # Sérialisation des listes en JSON
+        regulatory_articles_json = json.dumps(doc_source.regulatory_articles)
+        scr_modules_json = json.dumps([m.value for m in doc_source.scr_modules])
+
+        # Conversion de la date
+        pub_date = doc_source.publication_date.isoformat() if doc_source.publication_date else None
+
+        return (
+            doc_source.id,
+            doc_source.title,
+            doc_source.doc_type.value,
+            doc_source.url,
+            doc_source.file_path,
+            pub_date,
+            regulatory_articles_json,
+            scr_modules_json,
+            doc_source.language,
+            doc_source.reliability_score,
+            doc_source.content_hash,
+            doc_source.last_updated.isoformat(),
+            _search_text(doc_source.title, doc_source.regulatory_articles)
+        )
+
     def get_document_by_id(self, doc_id: str) -> Optional[DocumentSource]:
         """
         Récupération d'un document par son ID
@@ -188,14 +393,13 @@ class SCRKnowledgeBase:
         """
         cursor = self.conn.cursor()
 
-        query = """
+        module_condition, params = self._modules_condition([scr_module])
+        query = f"""
             SELECT * FROM documents 
-            WHERE scr_modules LIKE ?
-            ORDER BY reliability_score DESC, publication_date DESC
+            WHERE {module_condition}
+            ORDER BY reliability_score DESC, publication_date DESC, rowid
         """
 
-        params = [f'%{scr_module.value}%']
-
         if limit:
             query += " LIMIT ?"
             params.append(limit)
@@ -209,6 +413,176 @@ class SCRKnowledgeBase:
         self.logger.debug(f"Trouvé {len(documents)} documents pour module {scr_module.value}")
         return documents
 
+    def get_module_bundle(self, scr_module: SCRModule, doc_limit: int = 5) -> ModuleBundle:
+        """
+        Documents et concepts d'un module SCR en un seul appel
+
+        Args:
+            scr_module: Module SCR ciblé
+            doc_limit: Nombre maximum de documents
+
+        Returns:
+            ModuleBundle du module
+        """
+        return self.get_module_bundles_many([scr_module], doc_limit)[scr_module]
+
+    def get_module_bundles_many(self,
+                                scr_modules: List[SCRModule],
+                                doc_limit: int = 5) -> Dict[SCRModule, ModuleBundle]:
+        """
+        Documents et concepts de plusieurs modules SCR : une requête par table
+
+        Mêmes critères et même ordre que get_documents_by_module /
+        get_concepts_by_module appelés module par module.
+
+        Args:
+            scr_modules: Modules SCR ciblés
+            doc_limit: Nombre maximum de documents par module
+
+        Returns:
+            Dict {module: ModuleBundle}
+        """
+        bundles = {module: ModuleBundle(scr_module=module) for module in scr_modules}
+        if not bundles:
+            return bundles
+
+        cursor = self.conn.cursor()
+
+        # Documents : une seule requête, répartition par module côté Python
+        # (rowid départage les ex aequo dans l'ordre d'insertion, quel que soit le plan d'exécution)
+        module_condition, params = self._modules_condition(list(bundles))
+        cursor.execute(f"""
+            SELECT * FROM documents
+            WHERE {module_condition}
+            ORDER BY reliability_score DESC, publication_date DESC, rowid
+        """, params)
+
+        module_tokens = {module: json.dumps(module.value) for module in bundles}
+        for row in cursor.fetchall():
+            document = None
+            for module, bundle in bundles.items():
+                # Module présent dans la liste JSON (valeur exacte, guillemets compris)
+                if module_tokens[module] in row['scr_modules'] and (not doc_limit or len(bundle.documents) < doc_limit):
+                    document = document or self._row_to_document_source(row)
+                    bundle.documents.append(document)
+
+        # Concepts
+        cursor.execute(f"""
+            SELECT * FROM scr_concepts
+            WHERE scr_module IN ({', '.join('?' for _ in bundles)})
+            ORDER BY concept_name
+        """, [module.value for module in bundles])
+
+        for row in cursor.fetchall():
+            concept = self._row_to_scr_concept(row)
+            bundles[concept.scr_module].concepts.append(concept)
+
+        return bundles
+
+    def get_documents_by_modules(self, scr_modules: List[SCRModule], limit: int = None) -> List[DocumentSource]:
+        """
+        Récupération en une requête des documents concernant au moins un des modules
+
+        Args:
+            scr_modules: Modules SCR ciblés
+            limit: Limite du nombre de résultats (optionnel)
+
+        Returns:
+            Liste des DocumentSource (sans doublon)
+        """
+        if not scr_modules:
+            return []
+
+        module_condition, params = self._modules_condition(scr_modules)
+        query = f"""
+            SELECT * FROM documents
+            WHERE {module_condition}
+            ORDER BY reliability_score DESC, publication_date DESC, rowid
+        """
+
+        if limit:
+            query += " LIMIT ?"
+            params.append(limit)
+
+        cursor = self.conn.cursor()
+        cursor.execute(query, params)
+
+        documents = [self._row_to_document_source(row) for row in cursor.fetchall()]
+
+        self.logger.debug(f"Trouvé {len(documents)} documents pour {len(scr_modules)} modules")
+        return documents
+
+    @staticmethod
+    def _modules_condition(scr_modules: List[SCRModule]):
+        """
+        Condition SQL « concerne au moins un des modules »
+
+        Résolue par la clé primaire de document_modules (scr_module, document_id)
+        plutôt que par un LIKE sur la liste JSON sérialisée.
+
+        Returns:
+            Tuple (fragment SQL, paramètres)
+        """
+        condition = (f"id IN (SELECT document_id FROM document_modules "
+                     f"WHERE scr_module IN ({', '.join('?' for _ in scr_modules)}))")
+        return condition, [module.value for module in scr_modules]
+
+    def search(self,
+               query: str = None,
+               scr_modules: List[SCRModule] = None,
+               doc_types: List[DocumentType] = None,
+               min_reliability: float = 0.0,
+               limit: int = None) -> List[DocumentSource]:
+        """
+        Recherche filtrée directement en SQL
+
+        Args:
+            query: Sous-chaîne recherchée dans le titre et les articles, sans tenir compte de la casse (optionnel)
+            scr_modules: Modules SCR à inclure (tous les modules par défaut)
+            doc_types: Types de documents à inclure (optionnel)
+            min_reliability: Score de fiabilité minimum
+            limit: Nombre maximum de résultats (optionnel)
+
+        Returns:
+            Liste des DocumentSource triés par fiabilité décroissante puis titre
+        """
+        module_condition, module_params = self._modules_condition(scr_modules or list(SCRModule))
+        conditions = [module_condition]
+        params: List[Any] = module_params
+
+        if doc_types:
+            conditions.append(f"doc_type IN ({', '.join('?' for _ in doc_types)})")
+            params.extend(doc_type.value for doc_type in doc_types)
+
+        if min_reliability:
+            conditions.append("reliability_score >= ?")
+            params.append(min_reliability)
+
+        if query:
+            # Sous-chaîne littérale dans search_lc, dont la casse est repliée par Python
+            # à l'écriture (accents compris) : LIKE ne replierait que l'ASCII
+            conditions.append("instr(search_lc, ?) > 0")
+            params.append(query.lower())
+
+        sql = f"""
+            SELECT * FROM documents
+            WHERE {' AND '.join(conditions)}
+            ORDER BY reliability_score DESC, title
+        """
+
+        # Top-K résolu par SQLite : seules les lignes retenues sont converties
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        cursor = self.conn.cursor()
+        cursor.execute(sql, params)
+
+        documents = [self._row_to_document_source(row) for row in cursor.fetchall()]
+
+        self.logger.debug(f"Recherche SQL: {len(documents)} documents trouvés")
+        return documents
+
     def _row_to_document_source(self, row: sqlite3.Row) -> DocumentSource:
         """Conversion d'une ligne DB en DocumentSource"""
 
@@ -258,37 +632,73 @@ class SCRKnowledgeBase:
             ID du concept créé, ou -1 si erreur
         """
         try:
+            self._begin()
             cursor = self.conn.cursor()
-
-            examples_json = json.dumps(concept.examples) if concept.examples else None
-
-            cursor.execute("""
-                INSERT INTO scr_concepts 
-                (concept_name, scr_module, definition, formula, regulatory_article, 
-                 source_document_id, examples, created_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                concept.concept_name,
-                concept.scr_module.value,
-                concept.definition,
-                concept.formula,
-                concept.regulatory_article,
-                concept.source_document_id,
-                examples_json,
-                concept.created_at.isoformat()
-            ))
+            cursor.execute(_INSERT_CONCEPT_SQL, self._concept_row(concept))
 
             concept_id = cursor.lastrowid
-            self.conn.commit()
+            self._commit()
+            self.version += 1
 
             self.logger.info(f"Concept ajouté: {concept.concept_name} (ID: {concept_id})")
             return concept_id
 
         except Exception as e:
             self.logger.error(f"Erreur ajout concept {concept.concept_name}: {e}")
-            self.conn.rollback()
+            self._rollback()
             return -1
 
+    def add_scr_concepts(self, concepts: List[SCRConcept]) -> List[int]:
+        """
+        Ajout de plusieurs concepts SCR en une seule transaction
+
+        Args:
+            concepts: SCRConcept à ajouter
+
+        Returns:
+            IDs des concepts créés dans l'ordre de la liste, ou -1 pour chacun si erreur
+        """
+        if not concepts:
+            return []
+
+        try:
+            self._begin()
+            cursor = self.conn.cursor()
+            cursor.executemany(_INSERT_CONCEPT_SQL, [self._concept_row(concept) for concept in concepts])
+
+            # executemany ne renseigne pas lastrowid : sous le verrou d'écriture, les IDs
+            # AUTOINCREMENT attribués sont consécutifs et se terminent au dernier inséré
+            cursor.execute("SELECT last_insert_rowid()")
+            last_id = cursor.fetchone()[0]
+            concept_ids = list(range(last_id - len(concepts) + 1, last_id + 1))
+
+            self._commit()
+            self.version += 1
+
+            self.logger.info(f"{len(concept_ids)} concepts ajoutés")
+            return concept_ids
+
+        except Exception as e:
+            self.logger.error(f"Erreur ajout groupé de {len(concepts)} concepts: {e}")
+            self._rollback()
+            return [-1] * len(concepts)
+
+    @staticmethod
+    def _concept_row(concept: SCRConcept) -> tuple:
+        """Paramètres de _INSERT_CONCEPT_SQL pour un concept"""
+        examples_json = json.dumps(concept.examples) if concept.examples else None
+
+        return (
+            concept.concept_name,
+            concept.scr_module.value,
+            concept.definition,
+            concept.formula,
+            concept.regulatory_article,
+            concept.source_document_id,
+            examples_json,
+            concept.created_at.isoformat()
+        )
+
     def get_concepts_by_module(self, scr_module: SCRModule) -> List[SCRConcept]:
         """Récupération des concepts par module SCR"""
         cursor = self.conn.cursor()
@@ -304,6 +714,60 @@ class SCRKnowledgeBase:
 
         return concepts
 
+    def get_concepts_by_modules(self, scr_modules: List[SCRModule]) -> List[SCRConcept]:
+        """Récupération en une requête des concepts de plusieurs modules SCR"""
+        if not scr_modules:
+            return []
+
+        cursor = self.conn.cursor()
+        cursor.execute(f"""
+            SELECT * FROM scr_concepts
+            WHERE scr_module IN ({', '.join('?' for _ in scr_modules)})
+            ORDER BY scr_module, concept_name
+        """, [module.value for module in scr_modules])
+
+        return [self._row_to_scr_concept(row) for row in cursor.fetchall()]
+
+    def iter_documents(self, batch_size: int = 1000) -> Iterator[DocumentSource]:
+        """
+        Parcours de tous les documents par lots, sans tout charger en mémoire
+
+        Args:
+            batch_size: Nombre de lignes lues par fetchmany
+
+        Returns:
+            Itérateur de DocumentSource
+        """
+        cursor = self.conn.cursor()
+        cursor.execute("SELECT * FROM documents ORDER BY id")
+
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            for row in rows:
+                yield self._row_to_document_source(row)
+
+    def iter_concepts(self, batch_size: int = 1000) -> Iterator[SCRConcept]:
+        """
+        Parcours de tous les concepts par lots, sans tout charger en mémoire
+
+        Args:
+            batch_size: Nombre de lignes lues par fetchmany
+
+        Returns:
+            Itérateur de SCRConcept
+        """
+        cursor = self.conn.cursor()
+        cursor.execute("SELECT * FROM scr_concepts ORDER BY id")
+
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            for row in rows:
+                yield self._row_to_scr_concept(row)
+
     def _row_to_scr_concept(self, row: sqlite3.Row) -> SCRConcept:
         """Conversion d'une ligne DB en SCRConcept"""
 
@@ -344,14 +808,13 @@ class SCRKnowledgeBase:
         """)
         doc_types_count = dict(cursor.fetchall())
 
-        # Comptage par module SCR (approximatif)
-        cursor.execute("SELECT scr_modules FROM documents")
-        module_counts = {}
-        for (modules_json,) in cursor.fetchall():
-            if modules_json:
-                modules = json.loads(modules_json)
-                for module in modules:
-                    module_counts[module] = module_counts.get(module, 0) + 1
+        # Comptage par module SCR (agrégé par SQLite sur document_modules, sans décoder le JSON)
+        cursor.execute("""
+            SELECT scr_module, COUNT(*)
+            FROM document_modules
+            GROUP BY scr_module
+        """)
+        module_counts = dict(cursor.fetchall())
 
         # Concepts par module
         cursor.execute("""
@@ -370,9 +833,46 @@ class SCRKnowledgeBase:
             'last_update': datetime.now().isoformat()
         }
 
+    def size_bytes(self) -> int:
+        """Taille de la base sur disque, journal WAL compris (pas encore reporté dans le fichier principal)"""
+        size = 0
+        for path in (Path(self.db_path), Path(f"{self.db_path}-wal")):
+            if path.exists():
+                size += path.stat().st_size
+        return size
+
+    def clear(self):
+        """Suppression de tous les documents et concepts (le schéma est conservé)"""
+        self._begin()
+        self.conn.execute("DELETE FROM documents")
+        self.conn.execute("DELETE FROM scr_concepts")
+
+        self._commit()
+        self.version += 1
+        self.logger.info("Base de connaissances vidée")
+
+    def flush(self):
+        """Copie de la base en mémoire vers le fichier db_path (sans effet sur disque)"""
+        if not self.in_memory:
+            return
+        if self.conn.in_transaction:
+            self.logger.warning("Copie sur disque ignorée : transaction en cours")
+            return
+
+        with closing(sqlite3.connect(self.db_path)) as disk_conn:
+            self.conn.backup(disk_conn)
+        self._last_snapshot = time.monotonic()
+        self.logger.debug(f"Base en mémoire copiée sur disque: {self.db_path}")
+
+    def _maybe_snapshot(self):
+        """Copie sur disque après une écriture validée, si la précédente est assez ancienne"""
+        if self.in_memory and time.monotonic() - self._last_snapshot >= Config.MEMORY_DB_SNAPSHOT_SECONDS:
+            self.flush()
+
     def close(self):
-        """Fermeture de la connexion à la base"""
+        """Fermeture de la connexion à la base (après copie sur disque si en mémoire)"""
         if self.conn:
+            self.flush()
             self.conn.close()
             self.logger.info("Connexion base de données fermée")
 
@@ -8,6 +8,7 @@ from typing import List, Optional, Dict, Any, Union
 from datetime import datetime, date
 from enum import Enum
 import json
+import re
 
 # Import des enums depuis config
 from ..config import DocumentType, SCRModule, AIProvider, ExpertiseLevel
@@ -212,6 +213,7 @@ class PromptConfig:
         custom_requirements: Exigences personnalisées
         context_level: Niveau de contexte à inclure
         technical_depth: Profondeur technique (1-5)
+        word_count_str: max_length sous forme de texte (calculé)
     """
     ai_provider: AIProvider
     expertise_level: ExpertiseLevel
@@ -226,6 +228,14 @@ class PromptConfig:
     context_level: str = "high"  # low, medium, high
     technical_depth: int = 3  # 1-5
 
+    # str(max_length), tenu à jour à chaque affectation de max_length
+    word_count_str: str = field(init=False, compare=False, repr=False)
+
+    def __setattr__(self, name: str, value: Any):
+        super().__setattr__(name, value)
+        if name == 'max_length':
+            super().__setattr__('word_count_str', str(value))
+
     def __post_init__(self):
         """Post-traitement après initialisation"""
         # Validation de la profondeur technique
@@ -333,25 +343,25 @@ class PromptGenerationResult:
 
     def save_to_file(self, filepath: str, include_metadata: bool = True):
         """Sauvegarde du prompt dans un fichier"""
-        content = self.prompt
+        # Sections réunies en une seule fois (pas de recopie du prompt à chaque ajout)
+        parts = [self.prompt]
 
         if include_metadata and self.success:
-            content += f"\n\n{'=' * 60}\n"
-            content += f"MÉTADONNÉES DE GÉNÉRATION\n"
-            content += f"{'=' * 60}\n"
-            content += f"IA: {self.config.ai_provider.value}\n"
-            content += f"Niveau: {self.config.expertise_level.value}\n"
-            content += f"Module: {self.config.scr_module.value}\n"
-            content += f"Temps génération: {self.generation_time:.3f}s\n"
-            content += f"Score qualité: {self.quality_score:.2f}\n"
+            parts.append(f"\n\n{'=' * 60}\n")
+            parts.append("MÉTADONNÉES DE GÉNÉRATION\n")
+            parts.append(f"{'=' * 60}\n")
+            parts.append(f"IA: {self.config.ai_provider.value}\n")
+            parts.append(f"Niveau: {self.config.expertise_level.value}\n")
+            parts.append(f"Module: {self.config.scr_module.value}\n")
+            parts.append(f"Temps génération: {self.generation_time:.3f}s\n")
+            parts.append(f"Score qualité: {self.quality_score:.2f}\n")
 
             if self.usage_recommendations:
-                content += f"\nRecommandations:\n"
-                for rec in self.usage_recommendations:
-                    content += f"- {rec}\n"
+                parts.append("\nRecommandations:\n")
+                parts.extend(f"- {rec}\n" for rec in self.usage_recommendations)
 
         with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(content)
+            f.write("".join(parts))
 
 
 @dataclass
@@ -431,6 +441,21 @@ class SearchCriteria:
                 not self.regulatory_articles)
 
 
+@dataclass
+class ModuleBundle:
+    """
+    Données d'un module SCR récupérées en un seul appel à la base
+
+    Attributes:
+        scr_module: Module SCR concerné
+        documents: Documents sources du module (les plus fiables d'abord)
+        concepts: Concepts SCR du module
+    """
+    scr_module: SCRModule
+    documents: List[DocumentSource] = field(default_factory=list)
+    concepts: List[SCRConcept] = field(default_factory=list)
+
+
 @dataclass
 class KnowledgeBaseStats:
     """
@@ -482,6 +507,14 @@ class KnowledgeBaseStats:
 # FONCTIONS UTILITAIRES
 # ==========================================
 
+# Expressions compilées une seule fois à l'import
+_TITLE_STRIP_RE = re.compile(r'[^\w\s-]')
+_TITLE_SPACES_RE = re.compile(r'\s+')
+
+# Articles valides : 180, 180a | 2015/35 | 2009/138/CE
+_REGULATORY_ARTICLE_FORMAT_RE = re.compile(r'\d+[a-z]?$|\d+/\d+$|\d+/\d+/CE$')
+
+
 def create_document_id(title: str, content_hash: str, doc_type: DocumentType) -> str:
     """
     Création d'un ID unique pour un document
@@ -494,11 +527,9 @@ def create_document_id(title: str, content_hash: str, doc_type: DocumentType) ->
     Returns:
         ID unique
     """
-    import re
-
     # Nettoyage du titre
-    clean_title = re.sub(r'[^\w\s-]', '', title.lower())
-    clean_title = re.sub(r'\s+', '_', clean_title)[:30]
+    clean_title = _TITLE_STRIP_RE.sub('', title.lower())
+    clean_title = _TITLE_SPACES_RE.sub('_', clean_title)[:30]
 
     return f"{doc_type.value}_{clean_title}_{content_hash[:8]}"
 
@@ -513,16 +544,7 @@ def validate_regulatory_article(article: str) -> bool:
     Returns:
         True si valide
     """
-    import re
-
-    # Patterns d'articles valides
-    patterns = [
-        r'^\d+[a-z]?$',  # 180, 180a
-        r'^\d+/\d+$',  # 2015/35
-        r'^\d+/\d+/CE$',  # 2009/138/CE
-    ]
-
-    return any(re.match(pattern, article) for pattern in patterns)
+    return _REGULATORY_ARTICLE_FORMAT_RE.match(article) is not None
 
 
 def estimate_reading_time(text: str) -> int:
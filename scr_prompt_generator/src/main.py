@@ -4,19 +4,197 @@
 # ==========================================
 
 import os
+import re
+import csv
+import copy
+import time
 import hashlib
 import logging
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from collections import deque
+from typing import Dict, List, Any, Optional, Tuple, Iterator, Union
+from concurrent.futures import ProcessPoolExecutor, Future
 
 from .config import Config, DocumentType, SCRModule, AIProvider, ExpertiseLevel
 from .knowledge.database import SCRKnowledgeBase
 from .knowledge.models import DocumentSource, PromptConfig, SCRConcept
-from .parsers import create_parser
+from .parsers import create_parser, HTMLParser, ParserCache
 from .prompts.generator import PromptEngineer
 
 
+# Concepts SCR repérés dans le texte des documents : (motif compilé, type de concept).
+# Une passe par motif, dans cet ordre (les correspondances de motifs différents
+# peuvent se chevaucher)
+_CONCEPT_PATTERNS = tuple(
+    (re.compile(pattern, re.IGNORECASE | re.MULTILINE), concept_type)
+    for pattern, concept_type in (
+        # Formules SCR
+        (r'SCR[_\s]*(\w+)\s*=\s*([^.\n]{10,100})', 'Formule SCR'),
+
+        # Facteurs et coefficients
+        (r'([Ff]acteur[^:]{0,30})\s*[:\-]\s*([^.\n]{10,80})', 'Facteur'),
+        (r'([Cc]oefficient[^:]{0,30})\s*[:\-]\s*([^.\n]{10,80})', 'Coefficient'),
+
+        # Duration et sensibilité
+        (r'([Dd]uration[^:]{0,30})\s*[:\-]\s*([^.\n]{10,80})', 'Duration'),
+        (r'([Ss]ensibilité[^:]{0,30})\s*[:\-]\s*([^.\n]{10,80})', 'Sensibilité'),
+
+        # Notations et ratings
+        (r'([Nn]otation[^:]{0,30})\s*[:\-]\s*([^.\n]{10,80})', 'Notation'),
+        (r'([Rr]ating[^:]{0,30})\s*[:\-]\s*([^.\n]{10,80})', 'Rating'),
+
+        # Chocs et stress
+        (r'([Cc]hoc[^:]{0,30})\s*[:\-]\s*([^.\n]{10,80})', 'Choc'),
+        (r'([Ss]tress[^:]{0,30})\s*[:\-]\s*([^.\n]{10,80})', 'Stress'),
+    )
+)
+
+# Suites d'espaces (normalisation des noms et définitions de concepts)
+_WHITESPACE_RE = re.compile(r'\s+')
+
+# Article réglementaire cité à proximité d'un concept
+_CONTEXT_ARTICLE_RE = re.compile(r'[Aa]rticle\s+(\d+[a-z]?)')
+
+# Export : taille des tampons d'écriture et fréquence de vidage CSV
+_EXPORT_BUFFER_SIZE = 1 << 20
+_CSV_FLUSH_ROWS = 10_000
+
+
+
+class _VectoredFileWriter:
+    """
+    Fichier texte en écriture seule : le texte est encodé par segments de 64KB
+    et les segments sont envoyés au noyau par os.writev (un appel par ~1MB)
+    """
+
+    _SEGMENT_SIZE = 64 * 1024
+
+    def __init__(self, path: Path, encoding: str = 'utf-8', chunk_size: int = _EXPORT_BUFFER_SIZE):
+        self._fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        self._encoding = encoding
+        self._chunk_size = chunk_size
+        self._parts = []  # Texte pas encore encodé
+        self._parts_size = 0
+        self._segments = deque()  # Segments encodés en attente d'écriture
+        self._segments_size = 0
+
+    def write(self, text: str) -> int:
+        self._parts.append(text)
+        self._parts_size += len(text)
+        if self._parts_size >= self._SEGMENT_SIZE:
+            self._encode_parts()
+            if self._segments_size >= self._chunk_size:
+                self._write_segments()
+        return len(text)
+
+    def _encode_parts(self):
+        if self._parts:
+            segment = ''.join(self._parts).encode(self._encoding)
+            self._segments.append(segment)
+            self._segments_size += len(segment)
+            self._parts = []
+            self._parts_size = 0
+
+    def _write_segments(self):
+        while self._segments:
+            written = os.writev(self._fd, self._segments)
+            self._segments_size -= written
+
+            # Retrait des segments écrits (écriture partielle possible)
+            while written:
+                segment = self._segments.popleft()
+                if written < len(segment):
+                    self._segments.appendleft(segment[written:])
+                    break
+                written -= len(segment)
+
+    def flush(self):
+        self._encode_parts()
+        self._write_segments()
+
+    def close(self):
+        if self._fd is not None:
+            try:
+                self.flush()
+            finally:
+                os.close(self._fd)
+                self._fd = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+def _open_export_file(path: Path):
+    """Ouverture d'un fichier d'export (os.writev si activé et disponible)"""
+    if Config.EXPORT_VECTORED_WRITES and hasattr(os, 'writev'):
+        return _VectoredFileWriter(path)
+    return open(path, 'w', newline='', encoding='utf-8', buffering=_EXPORT_BUFFER_SIZE)
+
+
+def _hash_content(text_content: str) -> str:
+    """Empreinte MD5 d'un contenu textuel"""
+    return hashlib.md5(text_content.encode('utf-8')).hexdigest()
+
+
+# Caches de parsing ouverts, par (processus, chemin) : une connexion SQLite
+# ne doit pas être partagée entre processus après un fork
+_PARSER_CACHES: Dict[Tuple[int, str], ParserCache] = {}
+
+
+def _get_parser_cache(cache_path: Optional[str]) -> Optional[ParserCache]:
+    """Cache de parsing du processus courant pour cache_path (None si désactivé)"""
+    if not cache_path:
+        return None
+
+    key = (os.getpid(), cache_path)
+    if key not in _PARSER_CACHES:
+        _PARSER_CACHES[key] = ParserCache(cache_path)
+    return _PARSER_CACHES[key]
+
+
+def _extract_document_content(file_path_or_url: str,
+                              cache_path: Optional[str] = None,
+                              content: Optional[Union[str, bytes]] = None,
+                              content_type: str = 'html',
+                              precomputed_content: Optional[Dict[str, Any]] = None
+                              ) -> Tuple[Dict[str, Any], List[str]]:
+    """
+    Parsing d'un document et extraction des articles réglementaires
+
+    Fonction de module pour pouvoir être exécutée dans un processus séparé.
+
+    Args:
+        file_path_or_url: Chemin fichier local ou URL (nom de la source si content est fourni)
+        cache_path: Base SQLite du cache de parsing (optionnel)
+        content: Contenu déjà en mémoire, parsé sans lecture du fichier (optionnel)
+        content_type: Type du contenu en mémoire ('html' uniquement)
+        precomputed_content: Résultat d'extraction déjà calculé, repris sans parsing (optionnel)
+
+    Returns:
+        Tuple (contenu extrait, articles réglementaires)
+    """
+    if precomputed_content is not None:
+        # Seule l'extraction des articles (expressions régulières) reste à faire
+        parser = HTMLParser()
+        content_data = precomputed_content
+    elif content is not None:
+        if content_type != 'html':
+            raise ValueError(f"Type de contenu en mémoire non supporté: {content_type}")
+        parser = HTMLParser()
+        content_data = parser.extract_from_content(content, file_path_or_url)
+    else:
+        parser = create_parser(file_path_or_url, _get_parser_cache(cache_path))
+        logging.getLogger(__name__).debug(f"Parser sélectionné: {type(parser).__name__}")
+
+        content_data = parser.extract_content_cached(file_path_or_url)
+    regulatory_articles = parser.extract_regulatory_articles(content_data.get('text_content') or '')
+    return content_data, regulatory_articles
+
+
 class SCRPromptGenerator:
     """
     Orchestrateur principal du système de génération de prompts SCR
@@ -28,13 +206,15 @@ class SCRPromptGenerator:
     - Gestion des statistiques et métadonnées
     """
 
-    def __init__(self, data_dir: str = None, db_path: str = None):
+    def __init__(self, data_dir: str = None, db_path: str = None, use_memory: bool = False):
         """
         Initialisation du générateur
 
         Args:
             data_dir: Répertoire de données (optionnel, utilise Config.DATA_DIR par défaut)
             db_path: Chemin base de données (optionnel, utilise Config.DEFAULT_DB_PATH par défaut)
+            use_memory: Base de connaissances chargée en mémoire, recopiée sur disque
+                périodiquement et à la fermeture (lectures sans accès disque)
         """
         # Configuration des chemins
         self.data_dir = Path(data_dir or Config.DATA_DIR)
@@ -48,7 +228,9 @@ class SCRPromptGenerator:
         self.logger = logging.getLogger(__name__)
 
         # Initialisation des composants principaux
-        self.knowledge_base = SCRKnowledgeBase(db_path or Config.DEFAULT_DB_PATH)
+        self.knowledge_base = SCRKnowledgeBase(db_path or Config.DEFAULT_DB_PATH, in_memory=use_memory)
+        self.parser_cache_path = (str(self.data_dir / Config.PARSER_CACHE_FILENAME)
+                                  if Config.PARSER_CACHE_ENABLED else None)
         self.prompt_engineer = PromptEngineer(self.knowledge_base)
 
         # Compteurs et statistiques
@@ -56,6 +238,12 @@ class SCRPromptGenerator:
         self._prompts_generated = 0
         self._startup_time = datetime.now()
 
+        # Cache des diagnostics de santé: deep -> (horodatage monotone, rapport)
+        self._health_cache = {}
+
+        # Résultats de génération: clé de configuration -> (horodatage monotone, version du rendu, résultat)
+        self._result_cache = {}
+
         self.logger.info("SCR Prompt Generator initialisé avec succès")
         self.logger.info(f"Répertoire de données: {self.data_dir}")
         self.logger.info(f"Base de données: {self.knowledge_base.db_path}")
@@ -88,14 +276,21 @@ class SCRPromptGenerator:
                             file_path_or_url: str,
                             doc_type: DocumentType,
                             scr_modules: List[SCRModule],
+                            content: Optional[Union[str, bytes]] = None,
+                            content_type: str = 'html',
+                            precomputed_content: Optional[Dict[str, Any]] = None,
                             **metadata) -> bool:
         """
         Ajout et traitement d'un nouveau document source
 
         Args:
-            file_path_or_url: Chemin fichier local ou URL
+            file_path_or_url: Chemin fichier local ou URL (nom de la source si content est fourni)
             doc_type: Type de document (regulation_eu, eiopa_guidelines, etc.)
             scr_modules: Liste des modules SCR concernés par ce document
+            content: Contenu du document déjà en mémoire, parsé sans passer par le disque (optionnel)
+            content_type: Type du contenu en mémoire ('html' uniquement)
+            precomputed_content: Résultat d'un parser déjà calculé (extract_content,
+                extract_from_content), enregistré sans nouveau parsing (optionnel)
             **metadata: Métadonnées additionnelles (title, url, reliability_score, etc.)
 
         Returns:
@@ -105,76 +300,239 @@ class SCRPromptGenerator:
             self.logger.info(f"Début traitement document: {file_path_or_url}")
 
             # 1. Vérification de la taille du fichier (si fichier local)
-            if not file_path_or_url.startswith(('http://', 'https://')):
-                file_path = Path(file_path_or_url)
-                if file_path.exists():
-                    file_size_mb = file_path.stat().st_size / (1024 * 1024)
-                    if file_size_mb > Config.MAX_FILE_SIZE_MB:
-                        self.logger.warning(f"Fichier volumineux ({file_size_mb:.1f}MB), traitement partiel possible")
+            if content is None and precomputed_content is None:
+                self._check_file_size(file_path_or_url)
 
             # 2. Parsing du document avec le parser approprié
-            parser = create_parser(file_path_or_url)
-            self.logger.debug(f"Parser sélectionné: {type(parser).__name__}")
-
-            content_data = parser.extract_content(file_path_or_url)
-
-            if not content_data.get('text_content'):
-                self.logger.warning(f"Aucun contenu textuel extrait de {file_path_or_url}")
-                return False
-
-            # 3. Calcul du hash pour détection des changements
-            text_content = content_data['text_content']
-            content_hash = hashlib.md5(text_content.encode('utf-8')).hexdigest()
-
-            # 4. Extraction automatique des articles réglementaires
-            regulatory_articles = parser.extract_regulatory_articles(text_content)
-            self.logger.debug(f"Articles extraits: {regulatory_articles}")
-
-            # 5. Génération de l'ID unique du document
-            source_name = self._extract_source_name(file_path_or_url)
-            doc_id = f"{doc_type.value}_{source_name}_{content_hash[:8]}"
-
-            # 6. Extraction du titre intelligent
-            title = metadata.get('title') or self._extract_title(content_data, file_path_or_url)
-
-            # 7. Création de l'objet DocumentSource
-            doc_source = DocumentSource(
-                id=doc_id,
-                title=title,
-                doc_type=doc_type,
-                url=file_path_or_url if file_path_or_url.startswith('http') else metadata.get('url'),
-                file_path=file_path_or_url if not file_path_or_url.startswith('http') else None,
-                publication_date=metadata.get('publication_date'),
-                regulatory_articles=regulatory_articles,
-                scr_modules=scr_modules,
-                language=metadata.get('language', self._detect_language(text_content)),
-                reliability_score=metadata.get('reliability_score',
-                                               self._calculate_reliability_score(content_data, doc_type)),
-                content_hash=content_hash,
-                metadata=self._extract_additional_metadata(content_data)
-            )
-
-            # 8. Sauvegarde dans la base de connaissances
-            success = self.knowledge_base.add_document(doc_source)
-
-            if success:
-                self.logger.info(f"Document ajouté avec succès: {doc_id}")
-                self._documents_processed += 1
+            content_data, regulatory_articles = _extract_document_content(file_path_or_url, self.parser_cache_path,
+                                                                          content, content_type,
+                                                                          precomputed_content)
 
-                # 9. Extraction automatique des concepts SCR
-                extracted_concepts = self._auto_extract_concepts(doc_source, text_content)
-                self.logger.info(f"Concepts extraits automatiquement: {len(extracted_concepts)}")
-
-                return True
-            else:
-                self.logger.error(f"Échec sauvegarde document: {doc_id}")
-                return False
+            # 3. Enregistrement dans la base de connaissances
+            return self._store_document(file_path_or_url, doc_type, scr_modules,
+                                        content_data, regulatory_articles, metadata)
 
         except Exception as e:
             self.logger.error(f"Erreur lors du traitement de {file_path_or_url}: {e}")
             self.logger.debug("Détails de l'erreur:", exc_info=True)
             return False
 
+    def add_document_sources(self, specs: Optional[List[Dict[str, Any]]] = None,
+                             max_workers: Optional[int] = None,
+                             **columns: List[Any]) -> List[bool]:
+        """
+        Ajout groupé de documents : parsing de tous les documents, puis une
+        transaction pour les documents et une pour les concepts extraits
+
+        Comme dans batch_process_documents, le parsing est réparti sur plusieurs
+        processus dès que plus d'un document est à parser (les specs avec
+        precomputed_content n'en ont pas besoin).
+
+        Les documents sont décrits soit ligne par ligne (specs), soit colonne par
+        colonne : une liste par argument de add_document_source, toutes de même longueur.
+
+        Args:
+            specs: Arguments de add_document_source pour chaque document
+                Format: [{'file_path_or_url': '...', 'doc_type': DocumentType, 'scr_modules': [...],
+                          'content': '<html>...' (optionnel), 'precomputed_content': {...} (optionnel),
+                          'title': '...', ...}, ...]
+            max_workers: Nombre de processus de parsing (défaut: os.cpu_count(), 1 = séquentiel)
+            **columns: Arguments en colonnes (si specs n'est pas fourni)
+                Format: file_path_or_url=[...], doc_type=[...], scr_modules=[...], title=[...], ...
+
+        Returns:
+            Succès de chaque document, dans l'ordre des specs (ou des colonnes)
+        """
+        if specs is None:
+            specs = self._specs_from_columns(columns)
+        elif columns:
+            raise ValueError("Documents à fournir soit en specs, soit en colonnes, pas les deux")
+
+        results = [False] * len(specs)
+        prepared = []  # (index, DocumentSource, texte)
+
+        self.logger.info(f"Début ajout groupé de {len(specs)} documents")
+
+        # 1. Lecture des specs et vérification des tailles de fichier
+        entries = []  # (index, source, type, modules, métadonnées, arguments de _extract_document_content)
+        for i, spec in enumerate(specs):
+            metadata = dict(spec)
+            file_path_or_url = metadata.pop('file_path_or_url')
+            doc_type = metadata.pop('doc_type')
+            scr_modules = metadata.pop('scr_modules')
+            content = metadata.pop('content', None)
+            content_type = metadata.pop('content_type', 'html')
+            precomputed_content = metadata.pop('precomputed_content', None)
+
+            try:
+                if content is None and precomputed_content is None:
+                    self._check_file_size(file_path_or_url)
+            except Exception as e:
+                self.logger.error(f"Erreur lors du traitement de {file_path_or_url}: {e}")
+                self.logger.debug("Détails de l'erreur:", exc_info=True)
+                continue
+
+            entries.append((i, file_path_or_url, doc_type, scr_modules, metadata,
+                            (file_path_or_url, self.parser_cache_path, content, content_type, precomputed_content)))
+
+        # 2. Parsing (en parallèle si plusieurs documents sont à parser) et préparation
+        to_parse = [entry for entry in entries if entry[5][4] is None]
+        futures = {}
+        executor = None
+        if len(to_parse) > 1 and max_workers != 1:
+            executor = ProcessPoolExecutor(max_workers=max_workers or os.cpu_count())
+            futures = {entry[0]: executor.submit(_extract_document_content, *entry[5]) for entry in to_parse}
+
+        try:
+            for i, file_path_or_url, doc_type, scr_modules, metadata, extract_args in entries:
+                try:
+                    if i in futures:
+                        content_data, regulatory_articles = futures[i].result()
+                    else:
+                        content_data, regulatory_articles = _extract_document_content(*extract_args)
+                    doc_source = self._build_document_source(file_path_or_url, doc_type, scr_modules,
+                                                             content_data, regulatory_articles, metadata)
+                    if doc_source is not None:
+                        prepared.append((i, doc_source, content_data['text_content']))
+
+                except Exception as e:
+                    self.logger.error(f"Erreur lors du traitement de {file_path_or_url}: {e}")
+                    self.logger.debug("Détails de l'erreur:", exc_info=True)
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+        if not prepared:
+            return results
+
+        # 3. Enregistrement des documents en une transaction
+        if not self.knowledge_base.add_documents([doc_source for _, doc_source, _ in prepared]):
+            self.logger.error(f"Échec sauvegarde groupée de {len(prepared)} documents")
+            return results
+
+        concepts = []
+        for i, doc_source, text_content in prepared:
+            results[i] = True
+            concepts.extend(self._find_concepts(doc_source, text_content))
+        self._documents_processed += len(prepared)
+
+        # 4. Enregistrement des concepts extraits en une transaction
+        concept_ids = self.knowledge_base.add_scr_concepts(concepts)
+        stored_concepts = sum(1 for concept_id in concept_ids if concept_id > 0)
+
+        self.logger.info(f"Ajout groupé terminé: {len(prepared)}/{len(specs)} documents, "
+                         f"{stored_concepts} concepts extraits")
+        return results
+
+    @staticmethod
+    def _specs_from_columns(columns: Dict[str, List[Any]]) -> List[Dict[str, Any]]:
+        """Conversion de colonnes de même longueur en specs (un dict par document)"""
+        lengths = {len(values) for values in columns.values()}
+        if len(lengths) > 1:
+            raise ValueError(f"Colonnes de longueurs différentes: "
+                             f"{ {name: len(values) for name, values in columns.items()} }")
+
+        names = list(columns)
+        return [dict(zip(names, row)) for row in zip(*columns.values())]
+
+    def _check_file_size(self, file_path_or_url: str):
+        """Avertissement si le fichier local dépasse Config.MAX_FILE_SIZE_MB"""
+        if not file_path_or_url.startswith(('http://', 'https://')):
+            file_path = Path(file_path_or_url)
+            if file_path.exists():
+                file_size_mb = file_path.stat().st_size / (1024 * 1024)
+                if file_size_mb > Config.MAX_FILE_SIZE_MB:
+                    self.logger.warning(f"Fichier volumineux ({file_size_mb:.1f}MB), traitement partiel possible")
+
+    def _store_document(self,
+                        file_path_or_url: str,
+                        doc_type: DocumentType,
+                        scr_modules: List[SCRModule],
+                        content_data: Dict[str, Any],
+                        regulatory_articles: List[str],
+                        metadata: Dict[str, Any]) -> bool:
+        """
+        Création et sauvegarde d'un document à partir du contenu déjà extrait
+
+        Args:
+            file_path_or_url: Chemin fichier local ou URL
+            doc_type: Type de document
+            scr_modules: Liste des modules SCR concernés
+            content_data: Résultat de parser.extract_content
+            regulatory_articles: Articles réglementaires extraits du texte
+            metadata: Métadonnées additionnelles (title, url, reliability_score, etc.)
+
+        Returns:
+            True si la sauvegarde a réussi, False sinon
+        """
+        doc_source = self._build_document_source(file_path_or_url, doc_type, scr_modules,
+                                                 content_data, regulatory_articles, metadata)
+        if doc_source is None:
+            return False
+
+        # Sauvegarde du document et de ses concepts : une seule transaction
+        with self.knowledge_base.batch():
+            success = self.knowledge_base.add_document(doc_source)
+
+            if success:
+                # Extraction automatique des concepts SCR
+                extracted_concepts = self._auto_extract_concepts(doc_source, content_data['text_content'])
+
+        if success:
+            self.logger.info(f"Document ajouté avec succès: {doc_source.id}")
+            self.logger.info(f"Concepts extraits automatiquement: {len(extracted_concepts)}")
+            self._documents_processed += 1
+            return True
+        else:
+            self.logger.error(f"Échec sauvegarde document: {doc_source.id}")
+            return False
+
+    def _build_document_source(self,
+                               file_path_or_url: str,
+                               doc_type: DocumentType,
+                               scr_modules: List[SCRModule],
+                               content_data: Dict[str, Any],
+                               regulatory_articles: List[str],
+                               metadata: Dict[str, Any]) -> Optional[DocumentSource]:
+        """
+        Création du DocumentSource à partir du contenu extrait (sans écriture en base)
+
+        Returns:
+            DocumentSource, ou None si aucun contenu textuel n'a été extrait
+        """
+        if not content_data.get('text_content'):
+            self.logger.warning(f"Aucun contenu textuel extrait de {file_path_or_url}")
+            return None
+
+        # Calcul du hash pour détection des changements
+        text_content = content_data['text_content']
+        content_hash = _hash_content(text_content)
+        self.logger.debug(f"Articles extraits: {regulatory_articles}")
+
+        # Génération de l'ID unique du document
+        source_name = self._extract_source_name(file_path_or_url)
+        doc_id = f"{doc_type.value}_{source_name}_{content_hash[:8]}"
+
+        # Extraction du titre intelligent
+        title = metadata.get('title') or self._extract_title(content_data, file_path_or_url)
+
+        # Création de l'objet DocumentSource
+        return DocumentSource(
+            id=doc_id,
+            title=title,
+            doc_type=doc_type,
+            url=file_path_or_url if file_path_or_url.startswith('http') else metadata.get('url'),
+            file_path=file_path_or_url if not file_path_or_url.startswith('http') else None,
+            publication_date=metadata.get('publication_date'),
+            regulatory_articles=regulatory_articles,
+            scr_modules=scr_modules,
+            language=metadata.get('language', self._detect_language(text_content)),
+            reliability_score=metadata.get('reliability_score',
+                                           self._calculate_reliability_score(content_data, doc_type)),
+            content_hash=content_hash,
+            metadata=self._extract_additional_metadata(content_data)
+        )
+
     def _extract_source_name(self, file_path_or_url: str) -> str:
         """Extraction du nom de source pour l'ID"""
         if file_path_or_url.startswith(('http://', 'https://')):
@@ -256,12 +614,13 @@ class SCRPromptGenerator:
         text_content = content_data.get('text_content', '')
 
         # Bonus si beaucoup de références réglementaires
-        article_count = len([word for word in text_content.split() if 'article' in word.lower()])
+        # Une seule copie en minuscules du texte, plutôt qu'un lower() par mot
+        article_count = sum(1 for word in text_content.lower().split() if 'article' in word)
         if article_count > 10:
             score += 0.1
 
         # Bonus si contenu substantiel
-        word_count = len(text_content.split())
+        word_count = self._content_word_count(content_data)
         if word_count > 5000:
             score += 0.05
         elif word_count < 500:
@@ -270,13 +629,21 @@ class SCRPromptGenerator:
         # Plafonnement
         return min(max(score, 0.1), 1.0)
 
+    @staticmethod
+    def _content_word_count(content_data: Dict[str, Any]) -> int:
+        """Nombre de mots du texte extrait (statistique du parser si présente, sans nouveau découpage)"""
+        word_count = (content_data.get('statistics') or {}).get('word_count')
+        if word_count is None:
+            word_count = len((content_data.get('text_content') or '').split())
+        return word_count
+
     def _extract_additional_metadata(self, content_data: Dict[str, Any]) -> Dict[str, Any]:
         """Extraction de métadonnées additionnelles"""
         metadata = {}
 
         # Statistiques de contenu
         text_content = content_data.get('text_content', '')
-        metadata['word_count'] = len(text_content.split())
+        metadata['word_count'] = self._content_word_count(content_data)
         metadata['char_count'] = len(text_content)
 
         # Métadonnées du parser
@@ -303,36 +670,33 @@ class SCRPromptGenerator:
         Returns:
             Liste des concepts extraits
         """
-        import re
+        concepts = self._find_concepts(doc_source, content)
 
+        # Ajout à la base en une seule transaction
         extracted_concepts = []
+        for concept, concept_id in zip(concepts, self.knowledge_base.add_scr_concepts(concepts)):
+            if concept_id > 0:
+                concept.id = concept_id
+                extracted_concepts.append(concept)
+                self.logger.debug(f"Concept extrait: {concept.concept_name}")
 
-        # Patterns pour identifier des concepts SCR
-        concept_patterns = [
-            # Formules SCR
-            (r'SCR[_\s]*(\w+)\s*=\s*([^.\n]{10,100})', 'Formule SCR'),
-
-            # Facteurs et coefficients
-            (r'([Ff]acteur[^:]{0,30})\s*[:\-]\s*([^.\n]{10,80})', 'Facteur'),
-            (r'([Cc]oefficient[^:]{0,30})\s*[:\-]\s*([^.\n]{10,80})', 'Coefficient'),
-
-            # Duration et sensibilité
-            (r'([Dd]uration[^:]{0,30})\s*[:\-]\s*([^.\n]{10,80})', 'Duration'),
-            (r'([Ss]ensibilité[^:]{0,30})\s*[:\-]\s*([^.\n]{10,80})', 'Sensibilité'),
+        return extracted_concepts
 
-            # Notations et ratings
-            (r'([Nn]otation[^:]{0,30})\s*[:\-]\s*([^.\n]{10,80})', 'Notation'),
-            (r'([Rr]ating[^:]{0,30})\s*[:\-]\s*([^.\n]{10,80})', 'Rating'),
+    def _find_concepts(self, doc_source: DocumentSource, content: str) -> List[SCRConcept]:
+        """
+        Repérage des concepts SCR dans le texte (sans écriture en base)
 
-            # Chocs et stress
-            (r'([Cc]hoc[^:]{0,30})\s*[:\-]\s*([^.\n]{10,80})', 'Choc'),
-            (r'([Ss]tress[^:]{0,30})\s*[:\-]\s*([^.\n]{10,80})', 'Stress'),
-        ]
+        Args:
+            doc_source: Document source
+            content: Contenu textuel du document
 
-        for pattern, concept_type in concept_patterns:
-            matches = re.finditer(pattern, content, re.IGNORECASE | re.MULTILINE)
+        Returns:
+            Concepts trouvés, un par module SCR du document
+        """
+        found_concepts = []
 
-            for match in matches:
+        for pattern, concept_type in _CONCEPT_PATTERNS:
+            for match in pattern.finditer(content):
                 concept_name = match.group(1).strip()
                 definition = match.group(2).strip()
 
@@ -342,32 +706,25 @@ class SCRPromptGenerator:
                         not any(char in definition for char in ['<', '>', '{', '}'])):  # Éviter HTML/code
 
                     # Nettoyage
-                    concept_name = re.sub(r'\s+', ' ', concept_name)
-                    definition = re.sub(r'\s+', ' ', definition)
+                    concept_name = _WHITESPACE_RE.sub(' ', concept_name)
+                    definition = _WHITESPACE_RE.sub(' ', definition)
 
                     # Recherche d'un article réglementaire dans le contexte
                     context = content[max(0, match.start() - 200):match.end() + 200]
-                    article_match = re.search(r'[Aa]rticle\s+(\d+[a-z]?)', context)
+                    article_match = _CONTEXT_ARTICLE_RE.search(context)
                     regulatory_article = article_match.group(1) if article_match else None
 
                     # Création du concept
                     for scr_module in doc_source.scr_modules:
-                        concept = SCRConcept(
+                        found_concepts.append(SCRConcept(
                             concept_name=concept_name,
                             scr_module=scr_module,
                             definition=definition,
                             regulatory_article=regulatory_article,
                             source_document_id=doc_source.id
-                        )
+                        ))
 
-                        # Ajout à la base
-                        concept_id = self.knowledge_base.add_scr_concept(concept)
-                        if concept_id > 0:
-                            concept.id = concept_id
-                            extracted_concepts.append(concept)
-                            self.logger.debug(f"Concept extrait: {concept_name}")
-
-        return extracted_concepts
+        return found_concepts
 
     def generate_optimized_prompt(self, config: PromptConfig) -> Dict[str, Any]:
         """
@@ -384,83 +741,179 @@ class SCRPromptGenerator:
 
         start_time = datetime.now()
 
+        cached = self._get_cached_result(config, start_time)
+        if cached:
+            return cached
+
         try:
             # Génération du prompt via le PromptEngineer
             prompt_content = self.prompt_engineer.generate_prompt(config)
 
-            # Collecte des métadonnées contextuelles
-            relevant_docs = self.knowledge_base.get_documents_by_module(config.scr_module)
-            concepts = self.knowledge_base.get_concepts_by_module(config.scr_module)
-
-            generation_time = (datetime.now() - start_time).total_seconds()
-
-            # Construction des métadonnées complètes
-            metadata = {
-                'config': {
-                    'ai_provider': config.ai_provider.value,
-                    'expertise_level': config.expertise_level.value,
-                    'scr_module': config.scr_module.value,
-                    'language': config.language,
-                    'output_format': config.output_format,
-                    'max_length': config.max_length,
-                    'include_examples': config.include_examples,
-                    'include_formulas': config.include_formulas
-                },
-                'generation_info': {
-                    'timestamp': datetime.now().isoformat(),
-                    'generation_time_seconds': generation_time,
-                    'prompt_length_chars': len(prompt_content),
-                    'prompt_length_words': len(prompt_content.split()),
-                    'estimated_tokens': len(prompt_content.split()) * 1.3,  # Estimation tokens
-                    'complexity_score': self._calculate_prompt_complexity(config, len(relevant_docs))
-                },
-                'knowledge_base_stats': {
-                    'relevant_documents': len(relevant_docs),
-                    'available_concepts': len(concepts),
-                    'top_sources': [
-                        {
-                            'title': doc.title,
-                            'type': doc.doc_type.value,
-                            'reliability': doc.reliability_score,
-                            'articles': doc.regulatory_articles[:3]
-                        }
-                        for doc in relevant_docs[:3]
-                    ]
-                },
-                'quality_indicators': {
-                    'has_regulatory_references': any(art.isdigit() for art in prompt_content.split()),
-                    'has_formulas': 'SCR' in prompt_content and ('=' in prompt_content or '×' in prompt_content),
-                    'has_examples': 'exemple' in prompt_content.lower() or 'example' in prompt_content.lower(),
-                    'structure_score': self._assess_prompt_structure(prompt_content)
-                }
-            }
+            # Métadonnées contextuelles : mêmes données que celles lues pour le prompt
+            bundle = self.prompt_engineer.get_module_context(config.scr_module)
 
-            # Génération des recommandations d'utilisation
-            usage_recommendations = self._generate_usage_recommendations(config, metadata)
+            return self._build_prompt_result(config, prompt_content, bundle.documents, bundle.concepts, start_time)
 
-            # Calcul du score de qualité global
-            quality_score = self._calculate_quality_score(prompt_content, metadata)
+        except Exception as e:
+            self.logger.error(f"Erreur génération prompt: {e}")
+            return self._failed_prompt_result(e)
 
-            self._prompts_generated += 1
+    def generate_optimized_prompts_batch(self, configs: List[PromptConfig]) -> List[Dict[str, Any]]:
+        """
+        Génération de plusieurs prompts optimisés avec lectures groupées de la base
 
-            return {
-                'prompt': prompt_content,
-                'metadata': metadata,
-                'usage_recommendations': usage_recommendations,
-                'quality_score': quality_score,
-                'success': True
-            }
+        Args:
+            configs: Configurations de génération
+
+        Returns:
+            Résultats au format de generate_optimized_prompt, dans l'ordre des configurations
+        """
+        self.logger.info(f"Génération groupée de {len(configs)} prompts")
+
+        start_time = datetime.now()
+
+        # Résultats déjà calculés servis par le cache ; seules les configurations manquantes sont générées
+        results = [self._get_cached_result(config, start_time) for config in configs]
+        missing = [i for i, result in enumerate(results) if result is None]
+        if not missing:
+            return results
+
+        missing_configs = [configs[i] for i in missing]
+
+        try:
+            # Prompts : une lecture de la base pour tous les modules non servis par le cache
+            prompts = self.prompt_engineer.generate_prompts_batch(missing_configs)
+
+            # Métadonnées contextuelles : données déjà lues pour les prompts
+            bundles = self.prompt_engineer.get_module_contexts([config.scr_module for config in missing_configs])
 
         except Exception as e:
-            self.logger.error(f"Erreur génération prompt: {e}")
-            return {
-                'prompt': '',
-                'metadata': {},
-                'usage_recommendations': [],
-                'quality_score': 0.0,
-                'success': False,
-                'error': str(e)
+            self.logger.error(f"Erreur génération groupée: {e}")
+            for i in missing:
+                results[i] = self._failed_prompt_result(e)
+            return results
+
+        for i, config, prompt_content in zip(missing, missing_configs, prompts):
+            bundle = bundles[config.scr_module]
+            try:
+                results[i] = self._build_prompt_result(config, prompt_content,
+                                                       bundle.documents, bundle.concepts, start_time)
+            except Exception as e:
+                self.logger.error(f"Erreur génération prompt: {e}")
+                results[i] = self._failed_prompt_result(e)
+
+        return results
+
+    def _build_prompt_result(self, config: PromptConfig, prompt_content: str,
+                             relevant_docs: List[DocumentSource], concepts: List[SCRConcept],
+                             start_time: datetime) -> Dict[str, Any]:
+        """Résultat complet d'une génération : prompt, métadonnées, recommandations et score"""
+        generation_time = (datetime.now() - start_time).total_seconds()
+        prompt_words = prompt_content.split()  # Découpage unique, partagé par les statistiques
+
+        # Construction des métadonnées complètes
+        metadata = {
+            'config': {
+                'ai_provider': config.ai_provider.value,
+                'expertise_level': config.expertise_level.value,
+                'scr_module': config.scr_module.value,
+                'language': config.language,
+                'output_format': config.output_format,
+                'max_length': config.max_length,
+                'include_examples': config.include_examples,
+                'include_formulas': config.include_formulas
+            },
+            'generation_info': {
+                'timestamp': datetime.now().isoformat(),
+                'generation_time_seconds': generation_time,
+                'prompt_length_chars': len(prompt_content),
+                'prompt_length_words': len(prompt_words),
+                'estimated_tokens': len(prompt_words) * 1.3,  # Estimation tokens
+                'complexity_score': self._calculate_prompt_complexity(config, len(relevant_docs))
+            },
+            'knowledge_base_stats': {
+                'relevant_documents': len(relevant_docs),
+                'available_concepts': len(concepts),
+                'top_sources': [
+                    {
+                        'title': doc.title,
+                        'type': doc.doc_type.value,
+                        'reliability': doc.reliability_score,
+                        'articles': doc.regulatory_articles[:3]
+                    }
+                    for doc in relevant_docs[:3]
+                ]
+            },
+            'quality_indicators': {
+                'has_regulatory_references': any(art.isdigit() for art in prompt_words),
+                'has_formulas': 'SCR' in prompt_content and ('=' in prompt_content or '×' in prompt_content),
+                'has_examples': 'exemple' in prompt_content.lower() or 'example' in prompt_content.lower(),
+                'structure_score': self._assess_prompt_structure(prompt_content)
             }
+        }
+
+        # Génération des recommandations d'utilisation
+        usage_recommendations = self._generate_usage_recommendations(config, metadata)
+
+        # Calcul du score de qualité global
+        quality_score = self._calculate_quality_score(prompt_content, metadata)
+
+        self._prompts_generated += 1
+
+        result = {
+            'prompt': prompt_content,
+            'metadata': metadata,
+            'usage_recommendations': usage_recommendations,
+            'quality_score': quality_score,
+            'success': True
+        }
+
+        self._result_cache[self._result_cache_key(config)] = (time.monotonic(), self.prompt_engineer.render_version,
+                                                              copy.deepcopy(result))
+        return result
+
+    @staticmethod
+    def _result_cache_key(config: PromptConfig) -> Tuple:
+        """Clé du cache des résultats (champs de config repris dans le prompt ou les métadonnées)"""
+        return (config.ai_provider, config.expertise_level, config.scr_module, config.max_length,
+                config.language, config.output_format, config.include_examples, config.include_formulas)
+
+    def _get_cached_result(self, config: PromptConfig, start_time: datetime) -> Optional[Dict[str, Any]]:
+        """
+        Résultat déjà calculé pour cette configuration et cette version du rendu
+
+        Seules les informations d'horodatage sont recalculées ; toute écriture en base
+        ou tout ajout de template (PromptEngineer.render_version) rend l'entrée obsolète.
+
+        Returns:
+            Copie du résultat, ou None si absent, expiré ou antérieur à une écriture en base
+            ou à un add_template
+        """
+        cached = self._result_cache.get(self._result_cache_key(config))
+        if not (cached and cached[1] == self.prompt_engineer.render_version
+                and time.monotonic() - cached[0] < Config.PROMPT_CACHE_TTL_SECONDS):
+            return None
+
+        result = copy.deepcopy(cached[2])
+        generation_info = result['metadata']['generation_info']
+        generation_info['timestamp'] = datetime.now().isoformat()
+        generation_info['generation_time_seconds'] = (datetime.now() - start_time).total_seconds()
+
+        self._prompts_generated += 1
+        self.logger.debug("Résultat de génération servi depuis le cache")
+        return result
+
+    @staticmethod
+    def _failed_prompt_result(error: Exception) -> Dict[str, Any]:
+        """Résultat d'une génération en échec"""
+        return {
+            'prompt': '',
+            'metadata': {},
+            'usage_recommendations': [],
+            'quality_score': 0.0,
+            'success': False,
+            'error': str(error)
+        }
 
     def _calculate_prompt_complexity(self, config: PromptConfig, docs_count: int) -> float:
         """Calcul du score de complexité du prompt (0-1)"""
@@ -593,13 +1046,19 @@ class SCRPromptGenerator:
 
         return recommendations
 
-    def batch_process_documents(self, documents_config: List[Dict[str, Any]]) -> Dict[str, bool]:
+    def batch_process_documents(self,
+                                documents_config: List[Dict[str, Any]],
+                                max_workers: Optional[int] = None) -> Dict[str, bool]:
         """
         Traitement en lot de plusieurs documents
 
+        Le parsing (coûteux en CPU) est réparti sur plusieurs processus ;
+        l'écriture dans la base reste séquentielle, dans l'ordre de la liste.
+
         Args:
             documents_config: Liste des configurations de documents
                 Format: [{'file_path': '...', 'doc_type': '...', 'scr_modules': [...], 'metadata': {...}}, ...]
+            max_workers: Nombre de processus de parsing (défaut: os.cpu_count(), 1 = séquentiel)
 
         Returns:
             Dict avec résultats par fichier {file_path: success_boolean}
@@ -609,33 +1068,60 @@ class SCRPromptGenerator:
 
         self.logger.info(f"Début traitement en lot de {total} documents")
 
-        for i, doc_config in enumerate(documents_config, 1):
-            file_path = doc_config['file_path']
+        if total <= 1 or max_workers == 1:
+            for i, doc_config in enumerate(documents_config, 1):
+                self._process_batch_entry(i, total, doc_config, results)
+        else:
+            with ProcessPoolExecutor(max_workers=max_workers or os.cpu_count()) as executor:
+                futures = [executor.submit(_extract_document_content, doc_config['file_path'], self.parser_cache_path)
+                           for doc_config in documents_config]
 
-            self.logger.info(f"[{i}/{total}] Traitement: {Path(file_path).name}")
+                for i, (doc_config, future) in enumerate(zip(documents_config, futures), 1):
+                    self._process_batch_entry(i, total, doc_config, results, future)
 
-            try:
+        success_count = sum(1 for r in results.values() if r)
+        self.logger.info(f"Traitement en lot terminé: {success_count}/{total} réussis")
+
+        return results
+
+    def _process_batch_entry(self,
+                             i: int,
+                             total: int,
+                             doc_config: Dict[str, Any],
+                             results: Dict[str, bool],
+                             future: Optional[Future] = None):
+        """Traitement d'une entrée du lot (parsing local ou résultat d'un processus)"""
+        file_path = doc_config['file_path']
+
+        self.logger.info(f"[{i}/{total}] Traitement: {Path(file_path).name}")
+
+        try:
+            doc_type = DocumentType(doc_config['doc_type'])
+            scr_modules = [SCRModule(m) for m in doc_config['scr_modules']]
+            metadata = doc_config.get('metadata', {})
+
+            if future is None:
                 success = self.add_document_source(
                     file_path_or_url=file_path,
-                    doc_type=DocumentType(doc_config['doc_type']),
-                    scr_modules=[SCRModule(m) for m in doc_config['scr_modules']],
-                    **doc_config.get('metadata', {})
+                    doc_type=doc_type,
+                    scr_modules=scr_modules,
+                    **metadata
                 )
-                results[file_path] = success
-
-                if success:
-                    self.logger.info(f"✅ [{i}/{total}] Succès: {Path(file_path).name}")
-                else:
-                    self.logger.warning(f"⚠️ [{i}/{total}] Échec: {Path(file_path).name}")
-
-            except Exception as e:
-                self.logger.error(f"❌ [{i}/{total}] Erreur {Path(file_path).name}: {e}")
-                results[file_path] = False
+            else:
+                self._check_file_size(file_path)
+                content_data, regulatory_articles = future.result()
+                success = self._store_document(file_path, doc_type, scr_modules,
+                                               content_data, regulatory_articles, metadata)
+            results[file_path] = success
 
-        success_count = sum(1 for r in results.values() if r)
-        self.logger.info(f"Traitement en lot terminé: {success_count}/{total} réussis")
+            if success:
+                self.logger.info(f"✅ [{i}/{total}] Succès: {Path(file_path).name}")
+            else:
+                self.logger.warning(f"⚠️ [{i}/{total}] Échec: {Path(file_path).name}")
 
-        return results
+        except Exception as e:
+            self.logger.error(f"❌ [{i}/{total}] Erreur {Path(file_path).name}: {e}")
+            results[file_path] = False
 
     def get_statistics(self) -> Dict[str, Any]:
         """
@@ -655,8 +1141,7 @@ class SCRPromptGenerator:
                 'data_directory': str(self.data_dir),
                 'documents_directory': str(self.documents_dir),
                 'database_path': self.knowledge_base.db_path,
-                'database_size_mb': Path(self.knowledge_base.db_path).stat().st_size / (1024 * 1024)
-                if Path(self.knowledge_base.db_path).exists() else 0,
+                'database_size_mb': self.knowledge_base.size_bytes() / (1024 * 1024),
                 'uptime_seconds': uptime.total_seconds(),
                 'startup_time': self._startup_time.isoformat()
             },
@@ -681,13 +1166,14 @@ class SCRPromptGenerator:
 
         return {**kb_stats, **system_stats}
 
-    def export_knowledge_base(self, export_path: str, format: str = 'json') -> bool:
+    def export_knowledge_base(self, export_path: str, format: str = 'json', pretty: bool = False) -> bool:
         """
         Export de la base de connaissances
 
         Args:
             export_path: Chemin du fichier d'export
             format: Format d'export ('json', 'csv', 'yaml')
+            pretty: JSON indenté (lecture humaine) ; compact par défaut
 
         Returns:
             True si l'export a réussi
@@ -695,16 +1181,26 @@ class SCRPromptGenerator:
         try:
             self.logger.info(f"Début export base de connaissances vers {export_path}")
 
-            # Récupération de toutes les données
-            all_docs = []
-            for module in SCRModule:
-                docs = self.knowledge_base.get_documents_by_module(module)
-                all_docs.extend([doc for doc in docs if doc not in all_docs])
+            # CSV : écriture en flux depuis la base, sans matérialiser le corpus
+            if format.lower() == 'csv':
+                export_path = Path(export_path)
+                export_path.parent.mkdir(parents=True, exist_ok=True)
+
+                docs_path = export_path.with_suffix('.documents.csv')
+                self._write_csv_rows(docs_path, map(self._document_export_row,
+                                                    self.knowledge_base.iter_documents()))
 
-            all_concepts = []
-            for module in SCRModule:
-                concepts = self.knowledge_base.get_concepts_by_module(module)
-                all_concepts.extend(concepts)
+                concepts_path = export_path.with_suffix('.concepts.csv')
+                self._write_csv_rows(concepts_path, map(self._concept_export_row,
+                                                        self.knowledge_base.iter_concepts()))
+
+                self.logger.info(f"Export CSV: {docs_path} et {concepts_path}")
+                self.logger.info(f"Export terminé: {export_path}")
+                return True
+
+            # Récupération de toutes les données
+            all_docs = self.knowledge_base.get_documents_by_modules(list(SCRModule))
+            all_concepts = self.knowledge_base.get_concepts_by_modules(list(SCRModule))
 
             # Préparation des données d'export
             export_data = {
@@ -714,32 +1210,8 @@ class SCRPromptGenerator:
                     'total_concepts': len(all_concepts),
                     'system_version': '1.0.0'
                 },
-                'documents': [
-                    {
-                        'id': doc.id,
-                        'title': doc.title,
-                        'doc_type': doc.doc_type.value,
-                        'scr_modules': [m.value for m in doc.scr_modules],
-                        'regulatory_articles': doc.regulatory_articles,
-                        'language': doc.language,
-                        'reliability_score': doc.reliability_score,
-                        'url': doc.url,
-                        'publication_date': doc.publication_date.isoformat() if doc.publication_date else None
-                    }
-                    for doc in all_docs
-                ],
-                'concepts': [
-                    {
-                        'id': concept.id,
-                        'concept_name': concept.concept_name,
-                        'scr_module': concept.scr_module.value,
-                        'definition': concept.definition,
-                        'formula': concept.formula,
-                        'regulatory_article': concept.regulatory_article,
-                        'examples': concept.examples
-                    }
-                    for concept in all_concepts
-                ]
+                'documents': [self._document_export_row(doc) for doc in all_docs],
+                'concepts': [self._concept_export_row(concept) for concept in all_concepts]
             }
 
             # Export selon le format
@@ -748,8 +1220,13 @@ class SCRPromptGenerator:
 
             if format.lower() == 'json':
                 import json
-                with open(export_path, 'w', encoding='utf-8') as f:
-                    json.dump(export_data, f, indent=2, ensure_ascii=False)
+                with _open_export_file(export_path) as f:
+                    if pretty:
+                        json.dump(export_data, f, indent=2, ensure_ascii=False)
+                    else:
+                        # json.dumps (sans indentation) passe par l'encodeur C, contrairement à
+                        # json.dump qui produit ses fragments en Python ; une seule écriture
+                        f.write(json.dumps(export_data, ensure_ascii=False, separators=(',', ':')))
 
             elif format.lower() == 'yaml':
                 try:
@@ -760,27 +1237,6 @@ class SCRPromptGenerator:
                     self.logger.error("PyYAML non installé pour export YAML")
                     return False
 
-            elif format.lower() == 'csv':
-                import csv
-
-                # Export des documents
-                docs_path = export_path.with_suffix('.documents.csv')
-                with open(docs_path, 'w', newline='', encoding='utf-8') as f:
-                    if all_docs:
-                        writer = csv.DictWriter(f, fieldnames=export_data['documents'][0].keys())
-                        writer.writeheader()
-                        writer.writerows(export_data['documents'])
-
-                # Export des concepts
-                concepts_path = export_path.with_suffix('.concepts.csv')
-                with open(concepts_path, 'w', newline='', encoding='utf-8') as f:
-                    if all_concepts:
-                        writer = csv.DictWriter(f, fieldnames=export_data['concepts'][0].keys())
-                        writer.writeheader()
-                        writer.writerows(export_data['concepts'])
-
-                self.logger.info(f"Export CSV: {docs_path} et {concepts_path}")
-
             else:
                 raise ValueError(f"Format non supporté: {format}")
 
@@ -791,11 +1247,64 @@ class SCRPromptGenerator:
             self.logger.error(f"Erreur lors de l'export: {e}")
             return False
 
+    @staticmethod
+    def _document_export_row(doc: DocumentSource) -> Dict[str, Any]:
+        """Représentation d'un document pour l'export"""
+        return {
+            'id': doc.id,
+            'title': doc.title,
+            'doc_type': doc.doc_type.value,
+            'scr_modules': [m.value for m in doc.scr_modules],
+            'regulatory_articles': doc.regulatory_articles,
+            'language': doc.language,
+            'reliability_score': doc.reliability_score,
+            'url': doc.url,
+            'publication_date': doc.publication_date.isoformat() if doc.publication_date else None
+        }
+
+    @staticmethod
+    def _concept_export_row(concept: SCRConcept) -> Dict[str, Any]:
+        """Représentation d'un concept pour l'export"""
+        return {
+            'id': concept.id,
+            'concept_name': concept.concept_name,
+            'scr_module': concept.scr_module.value,
+            'definition': concept.definition,
+            'formula': concept.formula,
+            'regulatory_article': concept.regulatory_article,
+            'examples': concept.examples
+        }
+
+    @staticmethod
+    def _write_csv_rows(csv_path: Path, rows: Iterator[Dict[str, Any]]) -> int:
+        """
+        Écriture CSV en flux (en-tête déduit de la première ligne)
+
+        Args:
+            csv_path: Fichier de sortie
+            rows: Itérateur de dicts de même structure
+
+        Returns:
+            Nombre de lignes écrites
+        """
+        count = 0
+        with _open_export_file(csv_path) as f:
+            writer = csv.writer(f, quoting=csv.QUOTE_MINIMAL)
+            for row in rows:
+                if count == 0:
+                    writer.writerow(row.keys())
+                writer.writerow(row.values())
+                count += 1
+                if count % _CSV_FLUSH_ROWS == 0:
+                    f.flush()
+        return count
+
     def search_documents(self,
                          query: str = None,
                          scr_modules: List[SCRModule] = None,
                          doc_types: List[DocumentType] = None,
-                         min_reliability: float = 0.0) -> List[DocumentSource]:
+                         min_reliability: float = 0.0,
+                         limit: int = None) -> List[DocumentSource]:
         """
         Recherche avancée dans les documents
 
@@ -804,57 +1313,39 @@ class SCRPromptGenerator:
             scr_modules: Modules SCR à filtrer
             doc_types: Types de documents à filtrer
             min_reliability: Score de fiabilité minimum
+            limit: Nombre maximum de résultats (optionnel)
 
         Returns:
             Liste des documents correspondants
         """
-        all_docs = []
-
-        # Collecte des documents par module si spécifié
-        if scr_modules:
-            for module in scr_modules:
-                docs = self.knowledge_base.get_documents_by_module(module)
-                all_docs.extend([doc for doc in docs if doc not in all_docs])
-        else:
-            # Tous les modules
-            for module in SCRModule:
-                docs = self.knowledge_base.get_documents_by_module(module)
-                all_docs.extend([doc for doc in docs if doc not in all_docs])
-
-        # Filtrage
-        filtered_docs = []
-
-        for doc in all_docs:
-            # Filtre par type de document
-            if doc_types and doc.doc_type not in doc_types:
-                continue
-
-            # Filtre par fiabilité
-            if doc.reliability_score < min_reliability:
-                continue
-
-            # Filtre par requête textuelle
-            if query:
-                query_lower = query.lower()
-                search_text = f"{doc.title} {' '.join(doc.regulatory_articles)}".lower()
-                if query_lower not in search_text:
-                    continue
-
-            filtered_docs.append(doc)
-
-        # Tri par pertinence (fiabilité puis titre)
-        filtered_docs.sort(key=lambda doc: (-doc.reliability_score, doc.title))
+        # Filtrage et tri (fiabilité puis titre) effectués par SQLite
+        filtered_docs = self.knowledge_base.search(
+            query=query,
+            scr_modules=scr_modules,
+            doc_types=doc_types,
+            min_reliability=min_reliability,
+            limit=limit
+        )
 
         self.logger.info(f"Recherche: {len(filtered_docs)} documents trouvés")
         return filtered_docs
 
-    def validate_system_health(self) -> Dict[str, Any]:
+    def validate_system_health(self, deep: bool = False, use_cache: bool = True) -> Dict[str, Any]:
         """
         Validation de la santé du système
 
+        Args:
+            deep: Inclure le test de génération de prompt (plus coûteux)
+            use_cache: Réutiliser un rapport de moins de Config.HEALTH_CHECK_TTL_SECONDS
+
         Returns:
             Dict avec statut et diagnostics
         """
+        if use_cache:
+            cached = self._health_cache.get(deep)
+            if cached and time.monotonic() - cached[0] < Config.HEALTH_CHECK_TTL_SECONDS:
+                return copy.deepcopy(cached[1])
+
         health_report = {
             'overall_status': 'healthy',
             'checks': {},
@@ -892,24 +1383,25 @@ class SCRPromptGenerator:
             except:
                 health_report['warnings'].append("Impossible de vérifier l'espace disque")
 
-            # Vérification des composants
-            try:
-                # Test génération prompt simple
-                test_config = PromptConfig(
-                    ai_provider=AIProvider.CLAUDE_SONNET_4,
-                    expertise_level=ExpertiseLevel.EXPERT,
-                    scr_module=SCRModule.SPREAD,
-                    max_length=100
-                )
-
-                result = self.prompt_engineer.generate_prompt(test_config)
-                if len(result) > 50:
-                    health_report['checks']['prompt_generation'] = 'ok'
-                else:
-                    health_report['warnings'].append("Génération de prompts limitée")
-            except Exception as e:
-                health_report['checks']['prompt_generation'] = 'error'
-                health_report['errors'].append(f"Erreur génération prompt: {e}")
+            # Vérification des composants (diagnostic approfondi uniquement)
+            if deep:
+                try:
+                    # Test génération prompt simple
+                    test_config = PromptConfig(
+                        ai_provider=AIProvider.CLAUDE_SONNET_4,
+                        expertise_level=ExpertiseLevel.EXPERT,
+                        scr_module=SCRModule.SPREAD,
+                        max_length=100
+                    )
+
+                    result = self.prompt_engineer.generate_prompt(test_config)
+                    if len(result) > 50:
+                        health_report['checks']['prompt_generation'] = 'ok'
+                    else:
+                        health_report['warnings'].append("Génération de prompts limitée")
+                except Exception as e:
+                    health_report['checks']['prompt_generation'] = 'error'
+                    health_report['errors'].append(f"Erreur génération prompt: {e}")
 
             # Statut final
             if health_report['errors']:
@@ -921,6 +1413,7 @@ class SCRPromptGenerator:
             health_report['overall_status'] = 'critical'
             health_report['errors'].append(f"Erreur critique validation: {e}")
 
+        self._health_cache[deep] = (time.monotonic(), copy.deepcopy(health_report))
         return health_report
 
     def cleanup_old_data(self, days_threshold: int = 30) -> Dict[str, int]:
@@ -974,6 +1467,10 @@ class SCRPromptGenerator:
             # Fermeture de la base de données
             self.knowledge_base.close()
 
+            parser_cache = _PARSER_CACHES.pop((os.getpid(), self.parser_cache_path), None)
+            if parser_cache:
+                parser_cache.close()
+
             self.logger.info("SCR Prompt Generator fermé proprement")
 
         except Exception as e:
@@ -1065,7 +1562,7 @@ if __name__ == "__main__":
         print(f"✅ Statistiques: {stats['total_documents']} documents")
 
         # Test de validation
-        health = generator.validate_system_health()
+        health = generator.validate_system_health(deep=True)
         print(f"✅ Santé système: {health['overall_status']}")
 
         # Test génération prompt simple
@@ -6,27 +6,31 @@
 Document parsers package
 """
 
+from typing import Optional
+
+from .cache import ParserCache
 from .base_parser import BaseDocumentParser
 from .pdf_parser import PDFParser
 from .html_parser import HTMLParser
 
 # Factory pour créer le bon parser
-def create_parser(file_path_or_url: str) -> BaseDocumentParser:
+def create_parser(file_path_or_url: str, cache: Optional[ParserCache] = None) -> BaseDocumentParser:
     """
     Factory pour créer le parser approprié
     
     Args:
         file_path_or_url: Chemin fichier ou URL
+        cache: Cache persistant des résultats de parsing (optionnel)
         
     Returns:
         Instance du parser approprié
     """
     if file_path_or_url.startswith(('http://', 'https://')):
-        return HTMLParser()
+        return HTMLParser(cache)
     elif file_path_or_url.lower().endswith('.pdf'):
-        return PDFParser()
+        return PDFParser(cache)
     elif file_path_or_url.lower().endswith(('.html', '.htm')):
-        return HTMLParser()
+        return HTMLParser(cache)
     else:
         raise ValueError(f"Type de fichier non supporté: {file_path_or_url}")
 
@@ -34,5 +38,6 @@ __all__ = [
     'BaseDocumentParser',
     'PDFParser', 
     'HTMLParser',
+    'ParserCache',
     'create_parser'
 ]
\ No newline at end of file
@@ -4,16 +4,52 @@
 # ==========================================
 
 from abc import ABC, abstractmethod
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 import logging
 import re
 
+from .cache import ParserCache, file_sha256
+
+# Version du format des résultats d'extraction, incluse dans les clés du cache de
+# parsing : à incrémenter à chaque changement du résultat (champs, texte, tableaux)
+# pour que les entrées produites par l'ancien code ne soient plus servies
+_CACHE_FORMAT_VERSION = 3
+
+
+# Mots-clés SCR recherchés dans les documents
+SCR_KEYWORDS = (
+    'SCR', 'spread', 'duration', 'rating', 'notation',
+    'facteur de stress', 'stress factor', 'choc',
+    'obligation', 'bond', 'crédit', 'credit',
+    'contrepartie', 'counterparty', 'concentration',
+    'taux', 'interest rate', 'actions', 'equity',
+    'devise', 'currency', 'opérationnel', 'operational'
+)
+
+# Formes en minuscules, calculées une seule fois (mêmes positions que SCR_KEYWORDS)
+_SCR_KEYWORDS_LOWER = tuple(keyword.lower() for keyword in SCR_KEYWORDS)
+
+
+# Références réglementaires : motifs compilés une seule fois, appliqués en passes
+# séparées (chaque motif garde sa recherche rapide sur préfixe littéral)
+_REGULATORY_ARTICLE_PATTERNS = tuple(
+    re.compile(pattern, re.IGNORECASE | re.MULTILINE)
+    for pattern in (
+        r'Article\s+(\d+[a-z]?)\b',  # Article 180, Article 180a
+        r'Art\.\s+(\d+[a-z]?)\b',  # Art. 180
+        r'Article\s+(\d+[a-z]?)\s*\([^)]+\)',  # Article 180 (bis)
+        r'(?:Règlement|Regulation).*?(\d+/\d+)',  # Règlement 2015/35
+        r'Directive.*?(\d+/\d+/CE)',  # Directive 2009/138/CE
+    )
+)
+
 
 class BaseDocumentParser(ABC):
     """Interface abstraite pour tous les parsers de documents"""
 
-    def __init__(self):
+    def __init__(self, cache: Optional[ParserCache] = None):
         self.logger = logging.getLogger(self.__class__.__name__)
+        self.cache = cache
 
     @abstractmethod
     def extract_content(self, file_path: str) -> Dict[str, Any]:
@@ -28,6 +64,36 @@ class BaseDocumentParser(ABC):
         """
         pass
 
+    def _cache_namespace(self) -> str:
+        """Préfixe des clés de cache (version du format et options qui changent le résultat)"""
+        return f"{self.__class__.__name__}:v{_CACHE_FORMAT_VERSION}"
+
+    def extract_content_cached(self, file_path: str) -> Dict[str, Any]:
+        """
+        Extraction du contenu avec court-circuit sur l'empreinte SHA-256 du fichier
+
+        Sans cache configuré, ou pour une URL (gérée par ETag dans HTMLParser),
+        équivaut à extract_content.
+
+        Args:
+            file_path: Chemin vers le fichier
+
+        Returns:
+            Dict contenant le contenu extrait
+        """
+        if self.cache is None or file_path.startswith(('http://', 'https://')):
+            return self.extract_content(file_path)
+
+        cache_key = f"{self._cache_namespace()}:{file_sha256(file_path)}"
+        content = self.cache.get(cache_key)
+        if content is not None:
+            self.logger.info(f"Contenu inchangé, résultat en cache: {file_path}")
+            return content
+
+        content = self.extract_content(file_path)
+        self.cache.put(cache_key, content)
+        return content
+
     def extract_regulatory_articles(self, content: str) -> List[str]:
         """
         Extraction des références d'articles réglementaires
@@ -38,26 +104,17 @@ class BaseDocumentParser(ABC):
         Returns:
             Liste des articles trouvés
         """
-        # Patterns pour identifier les articles réglementaires
-        patterns = [
-            r'Article\s+(\d+[a-z]?)\b',  # Article 180, Article 180a
-            r'Art\.\s+(\d+[a-z]?)\b',  # Art. 180
-            r'Article\s+(\d+[a-z]?)\s*\([^)]+\)',  # Article 180 (bis)
-            r'(?:Règlement|Regulation).*?(\d+/\d+)',  # Règlement 2015/35
-            r'Directive.*?(\d+/\d+/CE)',  # Directive 2009/138/CE
-        ]
-
         articles = set()  # Pour éviter les doublons
 
-        for pattern in patterns:
-            matches = re.finditer(pattern, content, re.IGNORECASE | re.MULTILINE)
-            for match in matches:
+        for pattern in _REGULATORY_ARTICLE_PATTERNS:
+            for match in pattern.finditer(content):
                 article = match.group(1).strip()
                 if article and len(article) <= 10:  # Filtrer les matches trop longs
                     articles.add(article)
 
-        # Tri et nettoyage
-        sorted_articles = sorted(list(articles), key=lambda x: (len(x), x))
+        # Tri par longueur puis alphabétique : deux tris stables à clés natives,
+        # sans lambda ni tuple par élément
+        sorted_articles = sorted(sorted(articles), key=len)
         self.logger.debug(f"Articles extraits: {sorted_articles}")
 
         return sorted_articles
@@ -72,20 +129,12 @@ class BaseDocumentParser(ABC):
         Returns:
             Liste des mots-clés SCR trouvés
         """
-        scr_keywords = [
-            'SCR', 'spread', 'duration', 'rating', 'notation',
-            'facteur de stress', 'stress factor', 'choc',
-            'obligation', 'bond', 'crédit', 'credit',
-            'contrepartie', 'counterparty', 'concentration',
-            'taux', 'interest rate', 'actions', 'equity',
-            'devise', 'currency', 'opérationnel', 'operational'
-        ]
-
-        found_keywords = []
+        # Une seule copie en minuscules, puis un test `in` (recherche en C) par mot-clé :
+        # nettement plus rapide qu'une alternation re qui essaie chaque mot-clé à chaque position
         content_lower = content.lower()
 
-        for keyword in scr_keywords:
-            if keyword.lower() in content_lower:
-                found_keywords.append(keyword)
-
-        return found_keywords
\ No newline at end of file
+        return [
+            keyword
+            for keyword, keyword_lower in zip(SCR_KEYWORDS, _SCR_KEYWORDS_LOWER)
+            if keyword_lower in content_lower
+        ]
\ No newline at end of file
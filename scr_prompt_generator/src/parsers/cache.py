@@ -0,0 +1,127 @@
+# ==========================================
+# Fichier: src/parsers/cache.py
+# ==========================================
+
+import sqlite3
+import json
+import zlib
+import hashlib
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, Any, Optional, Tuple
+
+
+def file_sha256(file_path: str) -> str:
+    """
+    Empreinte SHA-256 du contenu d'un fichier
+
+    Args:
+        file_path: Chemin vers le fichier
+
+    Returns:
+        Empreinte hexadécimale
+    """
+    with open(file_path, 'rb') as file:
+        if hasattr(hashlib, 'file_digest'):  # Python 3.11+ : hachage côté C
+            return hashlib.file_digest(file, 'sha256').hexdigest()
+
+        digest = hashlib.sha256()
+        for chunk in iter(lambda: file.read(1024 * 1024), b''):
+            digest.update(chunk)
+        return digest.hexdigest()
+
+
+class ParserCache:
+    """Cache persistant (SQLite) des résultats de parsing"""
+
+    def __init__(self, db_path: str):
+        """
+        Initialisation du cache
+
+        Args:
+            db_path: Chemin vers la base SQLite du cache
+        """
+        self.db_path = str(db_path)
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+
+        Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+
+        self.conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS parse_cache (
+                cache_key TEXT PRIMARY KEY,
+                etag TEXT,
+                content BLOB NOT NULL,  -- JSON compressé (zlib) ; TEXT JSON pour les anciennes entrées
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        self.conn.commit()
+
+    def get_entry(self, cache_key: str) -> Optional[Tuple[Optional[str], Dict[str, Any]]]:
+        """
+        Récupération d'une entrée du cache
+
+        Args:
+            cache_key: Clé (empreinte du fichier ou URL)
+
+        Returns:
+            Tuple (etag, contenu extrait) ou None si absent
+        """
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT etag, content FROM parse_cache WHERE cache_key = ?", (cache_key,)
+            ).fetchone()
+
+        if row is None:
+            return None
+
+        content = row[1]
+        try:
+            if isinstance(content, bytes):
+                content = zlib.decompress(content).decode('utf-8')
+            return row[0], json.loads(content)
+        except (ValueError, zlib.error):
+            self.logger.warning(f"Entrée de cache illisible ignorée: {cache_key}")
+            return None
+
+    def get(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        """Contenu extrait en cache, ou None si absent"""
+        entry = self.get_entry(cache_key)
+        return entry[1] if entry else None
+
+    def put(self, cache_key: str, content: Dict[str, Any], etag: Optional[str] = None):
+        """
+        Enregistrement d'un résultat de parsing
+
+        Args:
+            cache_key: Clé (empreinte du fichier ou URL)
+            content: Résultat de extract_content
+            etag: ETag HTTP associé (URLs uniquement)
+        """
+        try:
+            payload = json.dumps(content, ensure_ascii=False, default=str)
+        except (TypeError, ValueError) as e:
+            self.logger.warning(f"Contenu non sérialisable, cache ignoré pour {cache_key}: {e}")
+            return
+
+        # Texte réglementaire très répétitif : moins de pages à lire et à garder en cache
+        payload = zlib.compress(payload.encode('utf-8'))
+
+        with self._lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO parse_cache (cache_key, etag, content) VALUES (?, ?, ?)",
+                (cache_key, etag, payload)
+            )
+            self.conn.commit()
+
+    def clear(self):
+        """Suppression de toutes les entrées"""
+        with self._lock:
+            self.conn.execute("DELETE FROM parse_cache")
+            self.conn.commit()
+
+    def close(self):
+        """Fermeture de la connexion"""
+        self.conn.close()
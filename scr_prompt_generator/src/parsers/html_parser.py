@@ -3,18 +3,45 @@
 # ==========================================
 
 import requests
-from bs4 import BeautifulSoup
+from requests.compat import chardet
+from bs4 import BeautifulSoup, SoupStrainer
 from urllib.parse import urljoin, urlparse
 from pathlib import Path
 from .base_parser import BaseDocumentParser
-from typing import Dict, Any
+from .cache import ParserCache
+from ..config import Config
+from typing import Dict, Any, Optional, Union
+
+try:
+    from lxml import etree  # Optionnel : constructeur d'arbre en C et lecture en flux
+    _SOUP_FEATURES = 'lxml'
+except ImportError:
+    etree = None
+    _SOUP_FEATURES = 'html.parser'  # Repli pur Python, plus lent
+
+# Balises conservées en mode content_only : texte réglementaire, titres, tableaux,
+# plus <title>, <meta> et <a> pour les métadonnées et les liens
+_CONTENT_TAGS = ('title', 'meta', 'a', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6',
+                 'p', 'li', 'div', 'table', 'tr', 'td', 'th')
+_CONTENT_STRAINER = SoupStrainer(_CONTENT_TAGS)
+
+# Lecture en flux : balises dont le contenu est ignoré (comme le nettoyage de
+# _parse_html_content) et balises dont le texte est relevé à la fermeture
+_STREAM_SKIPPED_TAGS = frozenset(('script', 'style', 'nav', 'footer', 'header'))
+_STREAM_HEADING_TAGS = frozenset(('h1', 'h2', 'h3', 'h4', 'h5', 'h6'))
+_STREAM_TEXT_TAGS = frozenset(('title', 'p', 'li', 'div', 'td', 'th', 'body')) | _STREAM_HEADING_TAGS
 
 
 class HTMLParser(BaseDocumentParser):
     """Parser pour pages web EIOPA, EUR-Lex"""
 
-    def __init__(self):
-        super().__init__()
+    def __init__(self, cache: Optional[ParserCache] = None, keep_raw_html: bool = False,
+                 content_only: bool = False):
+        super().__init__(cache)
+        self.keep_raw_html = keep_raw_html  # Conserver le HTML brut dans le résultat
+        # Arbre limité à _CONTENT_TAGS (plus rapide ; le texte hors de ces balises est
+        # ignoré, celui qu'elles contiennent est gardé même sous nav/footer/header)
+        self.content_only = content_only
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'SCR-Prompt-Generator/1.0 (Research Tool)'
@@ -40,22 +67,79 @@ class HTMLParser(BaseDocumentParser):
         """Extraction depuis une URL"""
         try:
             self.logger.info(f"Récupération de l'URL: {url}")
-            response = self.session.get(url, timeout=self.timeout)
-            response.raise_for_status()
-
-            # Détection de l'encodage
-            response.encoding = response.apparent_encoding or 'utf-8'
-            html_content = response.text
+            max_bytes = Config.MAX_FILE_SIZE_MB * 1024 * 1024
+
+            # Requête conditionnelle si une version est déjà en cache
+            cache_key = f"{self._cache_namespace()}:url:{url}"
+            cached = self.cache.get_entry(cache_key) if self.cache else None
+            headers = {'If-None-Match': cached[0]} if cached and cached[0] else {}
+
+            # Lecture en flux avec plafond de taille
+            with self.session.get(url, timeout=self.timeout, stream=True, headers=headers) as response:
+                if response.status_code == 304 and cached:
+                    self.logger.info(f"Contenu inchangé (ETag), résultat en cache: {url}")
+                    return cached[1]
+
+                response.raise_for_status()
+                etag = response.headers.get('ETag')
+
+                body = bytearray()
+                truncated = False
+                for chunk in response.iter_content(chunk_size=64 * 1024):
+                    body.extend(chunk)
+                    if len(body) > max_bytes:
+                        self.logger.warning(f"Page tronquée à {Config.MAX_FILE_SIZE_MB}MB: {url}")
+                        del body[max_bytes:]
+                        truncated = True
+                        break
+
+                html_content = self._decode_body(bytes(body), response.headers.get('Content-Type', ''),
+                                                 truncated=truncated)
 
             # Parsing
-            soup = BeautifulSoup(html_content, 'html.parser')
+            soup = self._make_soup(html_content)
 
-            return self._parse_html_content(soup, url, html_content)
+            result = self._parse_html_content(soup, url, html_content, keep_raw_html=self.keep_raw_html)
+            if self.cache and etag:
+                self.cache.put(cache_key, result, etag=etag)
+            return result
 
         except Exception as e:
             self.logger.error(f"Erreur récupération URL {url}: {e}")
             raise
 
+    def _decode_body(self, body: bytes, content_type: str, truncated: bool = False) -> str:
+        """
+        Décodage du corps HTTP
+
+        Args:
+            body: Contenu brut de la réponse
+            content_type: En-tête Content-Type
+            truncated: Corps coupé à la taille maximale (dernier caractère possiblement incomplet)
+
+        Returns:
+            Contenu décodé
+        """
+        # 1. Charset déclaré dans l'en-tête
+        if 'charset=' in content_type.lower():
+            encoding = requests.utils.get_encoding_from_headers({'content-type': content_type})
+            try:
+                return body.decode(encoding, errors='replace')
+            except LookupError:
+                self.logger.debug(f"Encodage inconnu: {encoding}")
+
+        # 2. UTF-8 (cas le plus courant)
+        try:
+            return body.decode('utf-8')
+        except UnicodeDecodeError as e:
+            # Coupure au milieu d'une séquence multi-octets : seul le caractère final est perdu
+            if truncated and e.reason == 'unexpected end of data':
+                return body[:e.start].decode('utf-8')
+
+        # 3. Détection (coûteuse) en dernier recours
+        encoding = chardet.detect(body).get('encoding') or 'utf-8'
+        return body.decode(encoding, errors='replace')
+
     def _extract_from_file(self, file_path: str) -> Dict[str, Any]:
         """Extraction depuis un fichier local"""
         file_path = Path(file_path)
@@ -64,22 +148,158 @@ class HTMLParser(BaseDocumentParser):
             raise FileNotFoundError(f"Fichier HTML non trouvé: {file_path}")
 
         try:
+            # Gros fichiers : lecture en flux, sans construire l'arbre complet
+            if (etree is not None and not self.keep_raw_html
+                    and file_path.stat().st_size > Config.HTML_STREAMING_THRESHOLD_MB * 1024 * 1024):
+                return self._parse_large_file(file_path)
+
             with open(file_path, 'r', encoding='utf-8') as file:
                 html_content = file.read()
 
-            soup = BeautifulSoup(html_content, 'html.parser')
+            soup = self._make_soup(html_content)
 
-            return self._parse_html_content(soup, str(file_path), html_content)
+            return self._parse_html_content(soup, str(file_path), html_content,
+                                            keep_raw_html=self.keep_raw_html)
 
         except Exception as e:
             self.logger.error(f"Erreur traitement fichier {file_path}: {e}")
             raise
 
-    def _parse_html_content(self, soup: BeautifulSoup, source: str, raw_html: str) -> Dict[str, Any]:
-        """Parsing du contenu HTML"""
+    def extract_from_content(self, html_content: Union[str, bytes], source: str) -> Dict[str, Any]:
+        """
+        Extraction depuis un contenu HTML déjà en mémoire (sans accès disque ni réseau)
+
+        Args:
+            html_content: HTML (texte, ou octets décodés comme une réponse HTTP sans charset)
+            source: Nom de la source (chemin ou URL d'origine, pour les métadonnées)
+
+        Returns:
+            Dict contenant le contenu extrait
+        """
+        if isinstance(html_content, bytes):
+            html_content = self._decode_body(html_content, '')
+
+        soup = self._make_soup(html_content)
+
+        return self._parse_html_content(soup, source, html_content, keep_raw_html=self.keep_raw_html)
+
+    def _cache_namespace(self) -> str:
+        """Préfixe des clés de cache, distinct selon le constructeur d'arbre et les options de résultat"""
+        namespace = f"{super()._cache_namespace()}:{_SOUP_FEATURES}"
+        if self.keep_raw_html:
+            namespace += ":raw"
+        if self.content_only:
+            namespace += ":content"
+        return namespace
+
+    def _make_soup(self, html_content: str) -> BeautifulSoup:
+        """Construction de l'arbre (limité à _CONTENT_TAGS en mode content_only)"""
+        return BeautifulSoup(html_content, _SOUP_FEATURES,
+                             parse_only=_CONTENT_STRAINER if self.content_only else None)
+
+    def _parse_large_file(self, file_path: Path) -> Dict[str, Any]:
+        """
+        Extraction en flux d'un gros fichier HTML (lxml.etree.iterparse)
+
+        Les éléments de _STREAM_TEXT_TAGS et les tableaux sont traités à leur
+        fermeture puis vidés : la mémoire ne croît pas avec la taille du document.
+        Les éléments en ligne (<strong>, <a>, ...) sont conservés jusqu'à la
+        fermeture de leur parent, dont ils font partie du texte. Le texte d'un
+        élément est relevé à sa fermeture (celui d'un <p> dans un <li> précède
+        donc celui du <li>) ; le texte hors de ces balises est relevé avec <body>.
+
+        Args:
+            file_path: Chemin du fichier HTML
+
+        Returns:
+            Dict au format de _parse_html_content
+        """
+        self.logger.info(f"Lecture en flux du fichier HTML: {file_path}")
+
+        text_parts = []
+        metadata = {'title': '', 'description': '', 'keywords': '', 'language': ''}
+        links = []
+        tables = []
+        headings = []
+
+        open_tables = []  # Tableaux ouverts : (index, lignes)
+        row = None
+        table_count = 0
+        skipped_depth = 0  # Profondeur dans les balises de _STREAM_SKIPPED_TAGS
+        meta_found = set()
+
+        for event, elem in etree.iterparse(str(file_path), events=('start', 'end'), html=True,
+                                           recover=True, encoding='utf-8'):
+            tag = elem.tag if isinstance(elem.tag, str) else ''
+
+            if event == 'start':
+                if tag in _STREAM_SKIPPED_TAGS:
+                    skipped_depth += 1
+                elif skipped_depth:
+                    continue
+                elif tag == 'table':
+                    open_tables.append((table_count, []))
+                    table_count += 1
+                elif tag == 'tr':
+                    row = []
+                continue
+
+            if tag in _STREAM_SKIPPED_TAGS:
+                skipped_depth -= 1
+                elem.clear(keep_tail=True)
+                continue
+            if skipped_depth:
+                continue
+
+            if tag == 'meta':
+                name = elem.get('name')
+                if name in ('description', 'keywords') and name not in meta_found:
+                    meta_found.add(name)
+                    metadata[name] = elem.get('content', '')
+
+            elif tag == 'a':
+                href = elem.get('href')
+                link_text = ''.join(part.strip() for part in elem.itertext())
+                if href is not None and len(link_text) > 3:
+                    links.append({'text': link_text[:100], 'url': href})
+
+            elif tag == 'tr':
+                if row and open_tables:
+                    open_tables[-1][1].append(row)
+                row = None
+
+            elif tag == 'table':
+                index, rows = open_tables.pop()
+                if rows:
+                    tables.append({'index': index, 'data': rows})
+
+            if tag in _STREAM_TEXT_TAGS:
+                strings = [part.strip() for part in elem.itertext()]
+                strings = [part for part in strings if part]
+                if strings:
+                    text_parts.append('\n'.join(strings))
+
+                if tag == 'title' and not metadata['title']:
+                    metadata['title'] = ''.join(elem.itertext()).strip()
+                elif tag in _STREAM_HEADING_TAGS:
+                    headings.append({'level': int(tag[1]), 'text': ''.join(strings)})
+                elif tag in ('td', 'th') and row is not None:
+                    row.append(''.join(strings))
+
+                elem.clear(keep_tail=True)
+            elif tag in ('tr', 'table', 'meta'):
+                elem.clear(keep_tail=True)
+
+        tables.sort(key=lambda table: table['index'])  # Ordre du document (imbrication)
+
+        return self._html_result('\n'.join(text_parts), metadata, links, tables, headings, str(file_path))
+
+    def _parse_html_content(self, soup: BeautifulSoup, source: str, raw_html: str,
+                            *, keep_raw_html: bool = False) -> Dict[str, Any]:
+        """Parsing du contenu HTML (le HTML brut n'est inclus que si keep_raw_html)"""
 
         # Nettoyage: suppression des scripts et styles
-        for element in soup(['script', 'style', 'nav', 'footer', 'header']):
+        for element in soup.select('script, style, nav, footer, header'):
             element.decompose()
 
         # Extraction du texte principal
@@ -121,13 +341,7 @@ class HTMLParser(BaseDocumentParser):
         # Extraction des tableaux
         tables = []
         for i, table in enumerate(soup.find_all('table')):
-            table_data = []
-            for row in table.find_all('tr'):
-                row_data = []
-                for cell in row.find_all(['td', 'th']):
-                    row_data.append(cell.get_text(strip=True))
-                if row_data:
-                    table_data.append(row_data)
+            table_data = self._table_rows(table)
 
             if table_data:
                 tables.append({
@@ -137,19 +351,51 @@ class HTMLParser(BaseDocumentParser):
 
         # Extraction des titres (structure)
         headings = []
-        for level in range(1, 7):  # h1 à h6
-            for heading in soup.find_all(f'h{level}'):
-                headings.append({
-                    'level': level,
-                    'text': heading.get_text(strip=True)
-                })
+        for heading in soup.select('h1, h2, h3, h4, h5, h6'):  # Ordre du document
+            headings.append({
+                'level': int(heading.name[1]),
+                'text': heading.get_text(strip=True)
+            })
+
+        result = self._html_result(text_content, metadata, links, tables, headings, source)
 
+        if keep_raw_html:
+            result['html_content'] = raw_html
+
+        return result
+
+    @staticmethod
+    def _table_rows(table) -> list:
+        """
+        Lignes non vides d'un tableau (texte des cellules td/th)
+
+        Un seul parcours des descendants au lieu d'un find_all par ligne ; un tableau
+        imbriquant d'autres tableaux garde le parcours ligne par ligne, dont les
+        lignes incluent les cellules des tableaux imbriqués.
+        """
+        if table.find('table') is not None:
+            rows = ([cell.get_text(strip=True) for cell in row.find_all(['td', 'th'])]
+                    for row in table.find_all('tr'))
+            return [row for row in rows if row]
+
+        rows = []
+        row = None
+        for element in table.find_all(['tr', 'td', 'th']):
+            if element.name == 'tr':
+                row = []
+                rows.append(row)
+            elif row is not None:
+                row.append(element.get_text(strip=True))
+        return [row for row in rows if row]
+
+    def _html_result(self, text_content: str, metadata: Dict[str, Any], links: list,
+                     tables: list, headings: list, source: str) -> Dict[str, Any]:
+        """Assemblage du résultat d'extraction HTML (statistiques comprises)"""
         # Statistiques
         word_count = len(text_content.split()) if text_content else 0
 
         result = {
             'text_content': text_content,
-            'html_content': raw_html,
             'metadata': metadata,
             'links': links[:50],  # Max 50 liens
             'tables': tables,
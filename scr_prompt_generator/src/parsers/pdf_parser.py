@@ -2,17 +2,18 @@
 # Fichier: src/parsers/pdf_parser.py
 # ==========================================
 
-import PyPDF2
 import pdfplumber
+import pypdfium2 as pdfium
 from pathlib import Path
 from .base_parser import BaseDocumentParser
-from typing import Dict, Any
+from .cache import ParserCache
+from typing import Dict, Any, Optional
 
 class PDFParser(BaseDocumentParser):
     """Parser pour documents PDF (Règlements UE, EIOPA docs)"""
 
-    def __init__(self):
-        super().__init__()
+    def __init__(self, cache: Optional[ParserCache] = None):
+        super().__init__(cache)
         self.max_pages = 200  # Limite pour éviter les docs trop volumineux
 
     def extract_content(self, file_path: str) -> Dict[str, Any]:
@@ -34,12 +35,11 @@ class PDFParser(BaseDocumentParser):
             raise ValueError(f"Le fichier n'est pas un PDF: {file_path}")
 
         try:
-            # Extraction avec PyPDF2 pour les métadonnées
-            with open(file_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-
+            # Texte et métadonnées via pypdfium2 (PDFium, code natif)
+            pdf = pdfium.PdfDocument(file_path)
+            try:
                 # Vérification du nombre de pages
-                num_pages = len(pdf_reader.pages)
+                num_pages = len(pdf)
                 if num_pages > self.max_pages:
                     self.logger.warning(f"Document volumineux ({num_pages} pages), traitement partiel")
                     pages_to_process = self.max_pages
@@ -47,26 +47,39 @@ class PDFParser(BaseDocumentParser):
                     pages_to_process = num_pages
 
                 # Métadonnées
+                pdf_metadata = pdf.get_metadata_dict(skip_empty=True)
                 metadata = {}
-                if pdf_reader.metadata:
+                if pdf_metadata:
                     metadata = {
-                        'title': pdf_reader.metadata.get('/Title', ''),
-                        'author': pdf_reader.metadata.get('/Author', ''),
-                        'subject': pdf_reader.metadata.get('/Subject', ''),
-                        'creator': pdf_reader.metadata.get('/Creator', ''),
-                        'creation_date': pdf_reader.metadata.get('/CreationDate', ''),
+                        'title': pdf_metadata.get('Title', ''),
+                        'author': pdf_metadata.get('Author', ''),
+                        'subject': pdf_metadata.get('Subject', ''),
+                        'creator': pdf_metadata.get('Creator', ''),
+                        'creation_date': pdf_metadata.get('CreationDate', ''),
                     }
 
-                # Extraction du texte avec PyPDF2
-                text_content = ""
+                # Extraction du texte
+                text_parts = []
                 for i in range(pages_to_process):
                     try:
-                        page_text = pdf_reader.pages[i].extract_text()
+                        page = pdf[i]
+                        try:
+                            textpage = page.get_textpage()
+                            try:
+                                page_text = textpage.get_text_range()
+                            finally:
+                                textpage.close()
+                        finally:
+                            page.close()  # Objets natifs libérés même si l'extraction échoue
                         if page_text:
-                            text_content += page_text + "\n"
+                            # PDFium sépare les lignes par \r\n : même texte que l'ancien backend
+                            text_parts.append(page_text.replace("\r\n", "\n").replace("\r", "\n") + "\n")
                     except Exception as e:
                         self.logger.warning(f"Erreur page {i + 1}: {e}")
                         continue
+                text_content = "".join(text_parts)
+            finally:
+                pdf.close()
 
             # Extraction des tableaux avec pdfplumber
             tables = []
@@ -74,6 +87,11 @@ class PDFParser(BaseDocumentParser):
                 with pdfplumber.open(file_path) as pdf:
                     for i, page in enumerate(pdf.pages[:min(10, pages_to_process)]):  # Max 10 pages pour les tableaux
                         page_tables = page.extract_tables()
+                        # Libère les objets de mise en page avant la page suivante
+                        # (Page.close n'existe pas dans les anciennes versions de pdfplumber)
+                        close_page = getattr(page, 'close', None)
+                        if close_page is not None:
+                            close_page()
                         if page_tables:
                             for table in page_tables:
                                 if table and len(table) > 1:  # Au moins 2 lignes
@@ -6,11 +6,12 @@
 Prompt generation package
 """
 
-from .templates import PromptTemplate, PromptTemplateLibrary
+from .templates import PromptTemplate, PromptTemplateLibrary, get_default_library
 from .generator import PromptEngineer
 
 __all__ = [
     'PromptTemplate',
     'PromptTemplateLibrary', 
+    'get_default_library',
     'PromptEngineer'
 ]
\ No newline at end of file
@@ -0,0 +1,8 @@
+# ==========================================
+# Fichier: src/prompts/_defaults/__init__.py
+# ==========================================
+
+"""
+Valeurs par défaut par module SCR (un fichier <module>.py par module,
+importé à la demande par PromptEngineer)
+"""
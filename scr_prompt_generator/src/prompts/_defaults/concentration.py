@@ -0,0 +1,19 @@
+# ==========================================
+# Fichier: src/prompts/_defaults/concentration.py
+# ==========================================
+
+"""
+Valeurs par défaut du SCR de concentration (chargées à la première utilisation)
+"""
+
+# Concepts par défaut si base vide
+CONCEPTS = (
+    "Seuils de concentration par émetteur",
+    "Facteurs de granularité",
+    "Traitement des expositions souveraines",
+    "Calcul des excès de concentration",
+    "Diversification géographique et sectorielle"
+)
+
+# Exemples chiffrés
+EXAMPLE = None
@@ -0,0 +1,19 @@
+# ==========================================
+# Fichier: src/prompts/_defaults/currency.py
+# ==========================================
+
+"""
+Valeurs par défaut du SCR de change (chargées à la première utilisation)
+"""
+
+# Concepts par défaut si base vide
+CONCEPTS = (
+    "Chocs de change par devise (25% standard)",
+    "Corrélations entre devises",
+    "Matching currency des actifs/passifs",
+    "Exemptions pour devises locales",
+    "Traitement des dérivés de change"
+)
+
+# Exemples chiffrés
+EXAMPLE = None
@@ -0,0 +1,27 @@
+# ==========================================
+# Fichier: src/prompts/_defaults/equity.py
+# ==========================================
+
+"""
+Valeurs par défaut du SCR actions (chargées à la première utilisation)
+"""
+
+# Concepts par défaut si base vide
+CONCEPTS = (
+    "Classification Type I (39%) et Type II (49%)",
+    "Ajustement symétrique (dampener ±17%)",
+    "Actions de long terme (LTEI) - traitement favorisé",
+    "Participations dans institutions financières",
+    "Duration-based equity sub-module",
+    "Critères d'éligibilité et conditions"
+)
+
+# Exemples chiffrés
+EXAMPLE = """
+#### Exemple 1 : Actions européennes Type I
+- **Portefeuille** : 500M€ d'actions CAC 40
+- **Choc de base** : 39% (avant ajustements)
+- **Ajustement symétrique** : +5% (market conditions)
+- **Choc final** : 39% + 5% = 44%
+- **SCR** : 500M€ × 44% = 220M€
+            """
@@ -0,0 +1,27 @@
+# ==========================================
+# Fichier: src/prompts/_defaults/interest_rate.py
+# ==========================================
+
+"""
+Valeurs par défaut du SCR de taux d'intérêt (chargées à la première utilisation)
+"""
+
+# Concepts par défaut si base vide
+CONCEPTS = (
+    "Chocs de taux haussier et baissier",
+    "Courbe des taux sans risque et extrapolation",
+    "Duration et convexité des passifs",
+    "Effet d'absorption par les provisions techniques",
+    "Corrélations avec module spread (50% → 25%)",
+    "Treatment des instruments dérivés de taux"
+)
+
+# Exemples chiffrés
+EXAMPLE = """
+#### Exemple 1 : Portefeuille obligations souveraines
+- **Duration moyenne** : 8,2 ans
+- **Choc haussier** : selon courbe réglementaire
+- **Choc baissier** : plancher à 0% (si applicable)
+- **Impact sur provisions** : calcul différentiel
+- **SCR final** : max(choc hausse, choc baisse)
+            """
@@ -0,0 +1,35 @@
+# ==========================================
+# Fichier: src/prompts/_defaults/spread.py
+# ==========================================
+
+"""
+Valeurs par défaut du SCR de spread (chargées à la première utilisation)
+"""
+
+# Concepts par défaut si base vide
+CONCEPTS = (
+    "Facteurs de stress par notation de crédit (AAA à Non noté)",
+    "Duration modifiée et calcul de sensibilité aux spreads",
+    "Traitement des obligations non notées (choc 30bp × duration)",
+    "Corrélations avec autres modules (taux, actions)",
+    "Exemptions souveraines et règles d'application",
+    "Formule SCR_spread = SCR_bonds + SCR_securitisation + SCR_cd",
+    "Grille des facteurs par notation et duration",
+    "Règles de plafonnement (100% de la valeur)"
+)
+
+# Exemples chiffrés
+EXAMPLE = """
+#### Exemple 1 : Obligation Corporate BBB
+- **Exposition** : 100M€ d'obligations Renault 2030
+- **Characteristics** : Notation BBB, duration modifiée 6,5 ans
+- **Calcul** : Stress = 6,5 × 2,5% = 16,25%
+- **SCR** : 100M€ × 16,25% = 16,25M€
+- **Impact net** : après corrélations et absorption passif
+
+#### Exemple 2 : Portefeuille diversifié  
+- **Composition** : 60% AAA (200M€), 30% BBB (100M€), 10% non noté (33M€)
+- **Calcul par tranche** avec facteurs respectifs
+- **Agrégation** : effet de diversification limité
+- **SCR total** : formule quadratique avec corrélations
+            """
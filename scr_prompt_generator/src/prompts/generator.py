@@ -2,22 +2,52 @@
 # Fichier: src/prompts/generator.py
 # ==========================================
 
+import time
 import logging
-from typing import Dict, List, Any
+import importlib
+from typing import Dict, List, Any, Optional, Tuple
 from ..knowledge.database import SCRKnowledgeBase
-from ..knowledge.models import DocumentSource, PromptConfig
-from ..config import AIProvider, ExpertiseLevel, SCRModule
-from .templates import PromptTemplateLibrary
+from ..knowledge.models import DocumentSource, ModuleBundle, PromptConfig, SCRConcept
+from ..config import Config, AIProvider, SCRModule
+from .templates import PromptTemplateLibrary, get_default_library, split_prompt
+
+
+# Nombre de documents cités comme sources réglementaires
+_CONTEXT_DOC_LIMIT = 5
+
+# Concepts et exemple si le module SCR n'a pas de valeurs par défaut (_defaults/<module>.py)
+_FALLBACK_CONCEPTS = ("Concepts à définir",)
+_FALLBACK_EXAMPLE = """
+#### À définir selon le module spécifique
+- Exemple concret avec données réalistes
+- Calcul détaillé étape par étape
+- Résultats commentés et contextualisés
+        """
 
 
 class PromptEngineer:
     """Moteur principal de génération de prompts optimisés"""
 
-    def __init__(self, knowledge_base: SCRKnowledgeBase):
+    # Modules _defaults/<module>.py déjà importés (None si le module SCR n'en a pas)
+    _module_defaults_cache: Dict[SCRModule, Any] = {}
+
+    def __init__(self, knowledge_base: SCRKnowledgeBase,
+                 template_library: Optional[PromptTemplateLibrary] = None):
+        """
+        Args:
+            knowledge_base: Base de connaissances SCR
+            template_library: Bibliothèque de templates (par défaut, bibliothèque partagée)
+        """
         self.kb = knowledge_base
-        self.template_library = PromptTemplateLibrary()
+        self.template_library = template_library or get_default_library()
         self.logger = logging.getLogger(__name__)
 
+        # Prompts rendus : clé de configuration -> (horodatage monotone, render_version, prompt)
+        self._render_cache: Dict[Tuple, Tuple[float, Tuple[int, int], str]] = {}
+
+        # Données lues en base : module SCR -> (version de la base, ModuleBundle complet)
+        self._context_cache: Dict[SCRModule, Tuple[int, ModuleBundle]] = {}
+
     def generate_prompt(self, config: PromptConfig) -> str:
         """
         Génération du prompt optimisé selon la configuration
@@ -28,42 +58,180 @@ class PromptEngineer:
         Returns:
             Prompt optimisé
         """
-        self.logger.info(f"Génération prompt: {config.ai_provider.value} - {config.scr_module.value}")
+        self.logger.info("Génération prompt: %s - %s", config.ai_provider.value, config.scr_module.value)
+
+        # 0. Prompt déjà rendu pour les mêmes paramètres
+        cached = self._get_cached_prompt(config)
+        if cached is not None:
+            return cached
+
+        # 1. Documents et concepts du module (lus une fois par version de la base)
+        bundle = self.get_module_context(config.scr_module)
+
+        # 2. Rendu
+        return self._render_from_bundle(config, bundle)
+
+    def generate_prompts_batch(self, configs: List[PromptConfig]) -> List[str]:
+        """
+        Génération de plusieurs prompts avec une seule lecture de la base
+
+        Les modules des configurations non servies par le cache sont chargés
+        en un appel à get_module_contexts.
+
+        Args:
+            configs: Configurations de génération
+
+        Returns:
+            Prompts dans l'ordre des configurations
+        """
+        prompts = [self._get_cached_prompt(config) for config in configs]
+
+        missing_modules = list(dict.fromkeys(
+            config.scr_module for config, prompt in zip(configs, prompts) if prompt is None
+        ))
+        if missing_modules:
+            bundles = self.get_module_contexts(missing_modules)
+            for i, config in enumerate(configs):
+                if prompts[i] is None:
+                    prompts[i] = self._render_from_bundle(config, bundles[config.scr_module])
+
+        return prompts
+
+    def get_module_context(self, scr_module: SCRModule) -> ModuleBundle:
+        """
+        Documents et concepts d'un module SCR, mémorisés jusqu'à la prochaine écriture en base
+
+        Args:
+            scr_module: Module SCR ciblé
+
+        Returns:
+            ModuleBundle complet du module (partagé : ne pas modifier)
+        """
+        return self.get_module_contexts([scr_module])[scr_module]
+
+    def get_module_contexts(self, scr_modules: List[SCRModule]) -> Dict[SCRModule, ModuleBundle]:
+        """
+        Documents et concepts de plusieurs modules SCR, une lecture groupée pour les absents du cache
 
-        # 1. Sélection du template approprié
+        La clé ne contient que le module et la version de la base : l'IA, le niveau
+        et la longueur n'influencent que le rendu, pas les données récupérées.
+
+        Args:
+            scr_modules: Modules SCR ciblés
+
+        Returns:
+            Dict {module: ModuleBundle} (bundles partagés : ne pas modifier)
+        """
+        version = self.kb.version
+        contexts = {}
+        missing_modules = []
+        for module in dict.fromkeys(scr_modules):
+            cached = self._context_cache.get(module)
+            if cached and cached[0] == version:
+                contexts[module] = cached[1]
+            else:
+                missing_modules.append(module)
+
+        if missing_modules:
+            for module, bundle in self.kb.get_module_bundles_many(missing_modules, doc_limit=None).items():
+                self._context_cache[module] = (version, bundle)
+                contexts[module] = bundle
+
+        return contexts
+
+    @staticmethod
+    def _cache_key(config: PromptConfig) -> Tuple:
+        """Clé du cache de rendu (seuls ces champs influencent le prompt)"""
+        return config.ai_provider, config.expertise_level, config.scr_module, config.max_length
+
+    @property
+    def render_version(self) -> Tuple[int, int]:
+        """Version des données du rendu : (version de la base, version de la bibliothèque de templates)"""
+        return self.kb.version, self.template_library.version
+
+    def _get_cached_prompt(self, config: PromptConfig) -> Optional[str]:
+        """Prompt en cache, ou None si absent, expiré ou antérieur à une écriture en base ou à un add_template"""
+        cached = self._render_cache.get(self._cache_key(config))
+        if (cached and cached[1] == self.render_version
+                and time.monotonic() - cached[0] < Config.PROMPT_CACHE_TTL_SECONDS):
+            self.logger.debug("Prompt servi depuis le cache")
+            return cached[2]
+        return None
+
+    def _render_from_bundle(self, config: PromptConfig, bundle: ModuleBundle) -> str:
+        """Rendu du template à partir des données du module, puis mise en cache"""
+
+        # Sélection du template approprié
         template = self.template_library.get_template(config.ai_provider, config.expertise_level)
 
-        # 2. Collecte des données contextuelles
-        context_data = self._gather_context_data(config)
+        # Collecte des données contextuelles
+        context_data = self._gather_context_data(config, bundle)
 
-        # 3. Rendu du template
+        # Rendu du template
         try:
             rendered_prompt = template.render(**context_data)
-            self.logger.info(f"Prompt généré avec succès ({len(rendered_prompt)} caractères)")
+            if self.logger.isEnabledFor(logging.INFO):
+                self.logger.info("Prompt généré avec succès (%d caractères)", len(rendered_prompt))
+            self._render_cache[self._cache_key(config)] = (time.monotonic(), self.render_version, rendered_prompt)
             return rendered_prompt
 
         except Exception as e:
-            self.logger.error(f"Erreur génération prompt: {e}")
+            self.logger.error("Erreur génération prompt: %s", e)
             raise
 
-    def _gather_context_data(self, config: PromptConfig) -> Dict[str, Any]:
+    def generate_prompt_blocks(self, config: PromptConfig) -> List[Dict[str, Any]]:
+        """
+        Génération du prompt sous forme de blocs de contenu pour l'API du fournisseur
+
+        Le préfixe statique ne dépend que du couple (IA, niveau) : pour Claude, il porte
+        un point d'arrêt cache_control afin d'être mis en cache côté API.
+
+        Args:
+            config: Configuration de génération
+
+        Returns:
+            Liste de blocs {'type': 'text', 'text': ...} (préfixe statique puis contexte dynamique)
+        """
+        static_prefix, dynamic_context = split_prompt(self.generate_prompt(config))
+
+        blocks = []
+        if static_prefix:
+            prefix_block = {'type': 'text', 'text': static_prefix}
+            if config.ai_provider == AIProvider.CLAUDE_SONNET_4:
+                prefix_block['cache_control'] = {'type': 'ephemeral'}
+            blocks.append(prefix_block)
+
+        blocks.append({'type': 'text', 'text': dynamic_context})
+        return blocks
+
+    def invalidate(self):
+        """
+        Vidage du cache des prompts rendus et des données de module
+
+        Les écritures via SCRKnowledgeBase (add_document, add_scr_concept) invalident
+        le cache automatiquement ; invalidate() est à appeler après toute autre
+        modification de la base (SQL direct, autre processus).
+        """
+        self._render_cache.clear()
+        self._context_cache.clear()
+
+    def _gather_context_data(self, config: PromptConfig, bundle: ModuleBundle) -> Dict[str, Any]:
         """Collecte des données contextuelles pour le prompt"""
 
         # Sources réglementaires pertinentes
-        relevant_docs = self.kb.get_documents_by_module(config.scr_module, limit=5)
-        regulatory_sources = self._format_regulatory_sources(relevant_docs)
+        regulatory_sources = self._format_regulatory_sources(bundle.documents[:_CONTEXT_DOC_LIMIT])
 
         # Concepts clés du module
-        key_concepts = self._extract_key_concepts(config.scr_module)
+        key_concepts = self._extract_key_concepts(config.scr_module, bundle.concepts)
 
-        # Exigences de structure
-        structure_requirements = self._generate_structure_requirements(config)
+        # Exigences de structure (précalculées par la bibliothèque)
+        structure_requirements = self.template_library.structure_for(config.ai_provider, config.expertise_level)
 
         # Exemples concrets
         concrete_examples = self._generate_examples(config.scr_module)
 
-        # Exigences qualité
-        quality_requirements = self._define_quality_requirements(config)
+        # Exigences qualité (précalculées par la bibliothèque)
+        quality_requirements = self.template_library.quality_for(config.ai_provider, config.expertise_level)
 
         return {
             'experience_years': '15',
@@ -74,7 +242,7 @@ class PromptEngineer:
             'structure_requirements': structure_requirements,
             'concrete_examples': concrete_examples,
             'quality_requirements': quality_requirements,
-            'word_count': str(config.max_length)
+            'word_count': config.word_count_str
         }
 
     def _format_regulatory_sources(self, docs: List[DocumentSource]) -> str:
@@ -84,67 +252,19 @@ class PromptEngineer:
 
         sources = ["### Sources prioritaires identifiées :"]
         for i, doc in enumerate(docs[:5], 1):
-            source_text = f"{i}. **{doc.title}**"
+            parts = [f"{i}. **{doc.title}**"]
             if doc.regulatory_articles:
-                articles = ', '.join(doc.regulatory_articles[:3])
-                source_text += f" (Articles: {articles})"
+                parts.append(f" (Articles: {', '.join(doc.regulatory_articles[:3])})")
             if doc.url:
-                source_text += f"\n   - URL: {doc.url}"
+                parts.append(f"\n   - URL: {doc.url}")
             if doc.reliability_score:
-                source_text += f" (Fiabilité: {doc.reliability_score:.1f}/1.0)"
-            sources.append(source_text)
+                parts.append(f" (Fiabilité: {doc.reliability_score:.1f}/1.0)")
+            sources.append("".join(parts))
 
         return "\n".join(sources)
 
-    def _extract_key_concepts(self, scr_module: SCRModule) -> str:
-        """Extraction des concepts clés par module SCR"""
-
-        # Récupération des concepts depuis la base
-        concepts_from_db = self.kb.get_concepts_by_module(scr_module)
-
-        # Concepts par défaut si base vide
-        default_concepts = {
-            SCRModule.SPREAD: [
-                "Facteurs de stress par notation de crédit (AAA à Non noté)",
-                "Duration modifiée et calcul de sensibilité aux spreads",
-                "Traitement des obligations non notées (choc 30bp × duration)",
-                "Corrélations avec autres modules (taux, actions)",
-                "Exemptions souveraines et règles d'application",
-                "Formule SCR_spread = SCR_bonds + SCR_securitisation + SCR_cd",
-                "Grille des facteurs par notation et duration",
-                "Règles de plafonnement (100% de la valeur)"
-            ],
-            SCRModule.INTEREST_RATE: [
-                "Chocs de taux haussier et baissier",
-                "Courbe des taux sans risque et extrapolation",
-                "Duration et convexité des passifs",
-                "Effet d'absorption par les provisions techniques",
-                "Corrélations avec module spread (50% → 25%)",
-                "Treatment des instruments dérivés de taux"
-            ],
-            SCRModule.EQUITY: [
-                "Classification Type I (39%) et Type II (49%)",
-                "Ajustement symétrique (dampener ±17%)",
-                "Actions de long terme (LTEI) - traitement favorisé",
-                "Participations dans institutions financières",
-                "Duration-based equity sub-module",
-                "Critères d'éligibilité et conditions"
-            ],
-            SCRModule.CONCENTRATION: [
-                "Seuils de concentration par émetteur",
-                "Facteurs de granularité",
-                "Traitement des expositions souveraines",
-                "Calcul des excès de concentration",
-                "Diversification géographique et sectorielle"
-            ],
-            SCRModule.CURRENCY: [
-                "Chocs de change par devise (25% standard)",
-                "Corrélations entre devises",
-                "Matching currency des actifs/passifs",
-                "Exemptions pour devises locales",
-                "Traitement des dérivés de change"
-            ]
-        }
+    def _extract_key_concepts(self, scr_module: SCRModule, concepts_from_db: List[SCRConcept]) -> str:
+        """Extraction des concepts clés par module SCR (concepts de la base fournis par l'appelant)"""
 
         # Combinaison concepts DB + défaut
         concepts = []
@@ -155,206 +275,37 @@ class PromptEngineer:
 
         # Ajout des concepts par défaut si pas assez
         if len(concepts) < 5:
-            default_list = default_concepts.get(scr_module, ["Concepts à définir"])
+            defaults = self._module_defaults(scr_module)
+            default_list = defaults.CONCEPTS if defaults else _FALLBACK_CONCEPTS
             for concept in default_list[:8 - len(concepts)]:
                 concepts.append(f"- {concept}")
 
         return "\n".join(concepts)
 
-    def _generate_structure_requirements(self, config: PromptConfig) -> str:
-        """Génération des exigences de structure selon le niveau"""
-
-        base_structure = {
-            ExpertiseLevel.EXPERT: """
-### 1. SYNTHÈSE EXÉCUTIVE (150 mots max)
-- Objectif réglementaire et périmètre d'application
-- Impact typique sur le ratio de solvabilité
-- Points d'attention critiques
-
-### 2. CADRE RÉGLEMENTAIRE DE RÉFÉRENCE  
-- Articles du Règlement délégué (numéros précis)
-- Directive mère et références pertinentes
-- Guidelines EIOPA et standards techniques
-- Évolutions récentes et futures
-
-### 3. MÉTHODOLOGIE DE CALCUL DÉTAILLÉE
-- Formule principale avec notation rigoureuse
-- Paramètres et variables (définitions précises)
-- Algorithme de calcul étape par étape
-- Cas particuliers et exceptions
-
-### 4. ASPECTS OPÉRATIONNELS
-- Données requises et sources
-- Fréquence de calcul et mise à jour
-- Contrôles de cohérence et validation
-- Interface avec autres modules SCR
-
-### 5. EXEMPLES CHIFFRÉS CONCRETS
-- Au moins 2 exemples détaillés
-- Calculs pas à pas avec résultats
-- Cas réalistes d'assureur français
-
-### 6. INTERACTIONS ET CORRÉLATIONS
-- Matrice de corrélation avec autres risques
-- Effet de diversification
-- Absorption par le passif
-
-### 7. ÉVOLUTIONS RÉGLEMENTAIRES
-- Révisions 2019 et 2025-2026
-- Impact estimé des changements
-- Calendrier d'application
-            """,
-
-            ExpertiseLevel.CONFIRMED: """
-### 1. Introduction et Objectifs
-- Contexte réglementaire du module
-- Objectif de couverture du risque
-
-### 2. Formule de Calcul
-- Formule principale
-- Définition des variables
-- Paramètres clés
-
-### 3. Données et Paramètres
-- Inputs nécessaires
-- Sources de données
-- Fréquence de mise à jour
-
-### 4. Exemples Pratiques
-- Cas d'application concrets
-- Calculs détaillés
-
-### 5. Points d'Attention
-- Difficultés d'implémentation
-- Contrôles à effectuer
-- Interactions avec autres modules
-            """,
-
-            ExpertiseLevel.JUNIOR: """
-### 1. Présentation Générale
-- Qu'est-ce que ce module SCR ?
-- Pourquoi est-il important ?
-
-### 2. Méthode de Calcul Simplifiée
-- Formule de base
-- Étapes principales
-
-### 3. Exemple Simple
-- Cas concret avec chiffres
-- Calcul étape par étape
-
-### 4. Points Clés à Retenir
-- Éléments essentiels
-- Erreurs à éviter
-            """
-        }
-
-        return base_structure.get(config.expertise_level, base_structure[ExpertiseLevel.CONFIRMED])
-
     def _generate_examples(self, scr_module: SCRModule) -> str:
         """Génération d'exemples concrets par module"""
+        defaults = self._module_defaults(scr_module)
+        return defaults.EXAMPLE if defaults and defaults.EXAMPLE else _FALLBACK_EXAMPLE
 
-        examples_map = {
-            SCRModule.SPREAD: """
-#### Exemple 1 : Obligation Corporate BBB
-- **Exposition** : 100M€ d'obligations Renault 2030
-- **Characteristics** : Notation BBB, duration modifiée 6,5 ans
-- **Calcul** : Stress = 6,5 × 2,5% = 16,25%
-- **SCR** : 100M€ × 16,25% = 16,25M€
-- **Impact net** : après corrélations et absorption passif
-
-#### Exemple 2 : Portefeuille diversifié  
-- **Composition** : 60% AAA (200M€), 30% BBB (100M€), 10% non noté (33M€)
-- **Calcul par tranche** avec facteurs respectifs
-- **Agrégation** : effet de diversification limité
-- **SCR total** : formule quadratique avec corrélations
-            """,
-
-            SCRModule.EQUITY: """
-#### Exemple 1 : Actions européennes Type I
-- **Portefeuille** : 500M€ d'actions CAC 40
-- **Choc de base** : 39% (avant ajustements)
-- **Ajustement symétrique** : +5% (market conditions)
-- **Choc final** : 39% + 5% = 44%
-- **SCR** : 500M€ × 44% = 220M€
-            """,
-
-            SCRModule.INTEREST_RATE: """
-#### Exemple 1 : Portefeuille obligations souveraines
-- **Duration moyenne** : 8,2 ans
-- **Choc haussier** : selon courbe réglementaire
-- **Choc baissier** : plancher à 0% (si applicable)
-- **Impact sur provisions** : calcul différentiel
-- **SCR final** : max(choc hausse, choc baisse)
-            """
-        }
-
-        return examples_map.get(scr_module, """
-#### À définir selon le module spécifique
-- Exemple concret avec données réalistes
-- Calcul détaillé étape par étape
-- Résultats commentés et contextualisés
-        """)
-
-    def _define_quality_requirements(self, config: PromptConfig) -> str:
-        """Définition des exigences qualité selon l'IA et le niveau"""
-
-        base_requirements = """
-### Format et Style
-- **Langue** : français professionnel, niveau expert
-- **Formules** : notation mathématique claire (LaTeX si complexe)
-- **Références** : numéros d'articles précis, pas de paraphrase
-- **Structure** : titres courts, paragraphes denses
-
-### Précision Technique
-- **Chiffres exacts** : facteurs officiels, pas d'approximation
-- **Cohérence** : liens entre sections, renvois internes
-- **Sources** : citations directes des textes réglementaires
-- **Exemples** : calculs vérifiables et représentatifs
+    @classmethod
+    def _module_defaults(cls, scr_module: SCRModule):
         """
+        Concepts et exemples par défaut d'un module SCR, importés à la première utilisation
 
-        ai_specific = {
-            AIProvider.CLAUDE_SONNET_4: """
-### Spécificités Claude
-- **Raisonnement** : étapes logiques détaillées, analyse structurée
-- **Contexte** : utilisation optimale du contexte étendu
-- **Nuances** : gestion des cas particuliers et exceptions
-- **Synthèse** : capacité à condenser l'information essentielle
-            """,
-
-            AIProvider.GPT_4: """
-### Spécificités GPT-4
-- **Précision** : formulations exactes et non ambiguës
-- **Structure** : organisation claire avec numérotation
-- **Exemples** : applications pratiques détaillées
-- **Références** : citations exactes et vérifiables
-            """,
-
-            AIProvider.GEMINI_PRO: """
-### Spécificités Gemini
-- **Créativité** : approches pédagogiques variées
-- **Multiformat** : tableaux, listes, diagrammes textuels
-- **Comparaisons** : mises en perspective avec autres modules
-- **Synthèse** : résumés exécutifs percutants
-            """
-        }
-
-        specific_req = ai_specific.get(config.ai_provider, "")
+        Args:
+            scr_module: Module SCR
 
-        return base_requirements + specific_req
+        Returns:
+            Module _defaults/<module>.py (CONCEPTS, EXAMPLE), ou None s'il n'existe pas
+        """
+        if scr_module not in cls._module_defaults_cache:
+            try:
+                defaults = importlib.import_module(f"._defaults.{scr_module.value}", package=__package__)
+            except ModuleNotFoundError:
+                defaults = None
+            cls._module_defaults_cache[scr_module] = defaults
+        return cls._module_defaults_cache[scr_module]
 
     def _get_module_french_name(self, scr_module: SCRModule) -> str:
         """Traduction des noms de modules en français"""
-        names_map = {
-            SCRModule.SPREAD: "SCR de spread (risque de crédit)",
-            SCRModule.INTEREST_RATE: "SCR de taux d'intérêt",
-            SCRModule.EQUITY: "SCR actions",
-            SCRModule.CURRENCY: "SCR de change",
-            SCRModule.CONCENTRATION: "SCR de concentration",
-            SCRModule.MARKET_GLOBAL: "SCR de marché global",
-            SCRModule.COUNTERPARTY: "SCR de contrepartie",
-            SCRModule.OPERATIONAL: "SCR opérationnel",
-            SCRModule.LIFE: "SCR vie",
-            SCRModule.NON_LIFE: "SCR non-vie"
-        }
-        return names_map.get(scr_module, f"SCR {scr_module.value}")
\ No newline at end of file
+        return getattr(scr_module, 'fr_name', f"SCR {scr_module.value}")
\ No newline at end of file
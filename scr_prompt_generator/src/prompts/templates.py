@@ -3,20 +3,227 @@
 # Fichier: src/prompts/templates.py
 # ==========================================
 
-from typing import Dict, List
+import re
+import functools
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
 from ..config import AIProvider, ExpertiseLevel, SCRModule
 
 
+# Variables « {nom} » d'un template (texte et contenu encodé)
+_VARIABLE_RE = re.compile(r"\{(\w+)\}")
+_VARIABLE_BYTES_RE = re.compile(rb"\{(\w+)\}")
+
+# Répertoire des textes des templates par défaut (UTF-8)
+_TEMPLATES_DIR = Path(__file__).parent / "templates_data"
+
+# Séparation entre le préfixe statique (mis en cache par les API LLM) et le contexte dynamique
+DYNAMIC_CONTEXT_MARKER = "# DYNAMIC CONTEXT"
+
+
+def split_prompt(prompt: str) -> Tuple[str, str]:
+    """
+    Découpage d'un prompt rendu en préfixe statique et contexte dynamique
+
+    Args:
+        prompt: Prompt rendu
+
+    Returns:
+        Tuple (préfixe statique, contexte dynamique) ; préfixe vide si le marqueur est absent
+    """
+    index = prompt.find(DYNAMIC_CONTEXT_MARKER)
+    if index < 0:
+        return "", prompt
+    return prompt[:index], prompt[index:]
+
+
+# Plans de document par niveau d'expertise
+_BASE_STRUCTURE = {
+    ExpertiseLevel.EXPERT: """
+### 1. SYNTHÈSE EXÉCUTIVE (150 mots max)
+- Objectif réglementaire et périmètre d'application
+- Impact typique sur le ratio de solvabilité
+- Points d'attention critiques
+
+### 2. CADRE RÉGLEMENTAIRE DE RÉFÉRENCE  
+- Articles du Règlement délégué (numéros précis)
+- Directive mère et références pertinentes
+- Guidelines EIOPA et standards techniques
+- Évolutions récentes et futures
+
+### 3. MÉTHODOLOGIE DE CALCUL DÉTAILLÉE
+- Formule principale avec notation rigoureuse
+- Paramètres et variables (définitions précises)
+- Algorithme de calcul étape par étape
+- Cas particuliers et exceptions
+
+### 4. ASPECTS OPÉRATIONNELS
+- Données requises et sources
+- Fréquence de calcul et mise à jour
+- Contrôles de cohérence et validation
+- Interface avec autres modules SCR
+
+### 5. EXEMPLES CHIFFRÉS CONCRETS
+- Au moins 2 exemples détaillés
+- Calculs pas à pas avec résultats
+- Cas réalistes d'assureur français
+
+### 6. INTERACTIONS ET CORRÉLATIONS
+- Matrice de corrélation avec autres risques
+- Effet de diversification
+- Absorption par le passif
+
+### 7. ÉVOLUTIONS RÉGLEMENTAIRES
+- Révisions 2019 et 2025-2026
+- Impact estimé des changements
+- Calendrier d'application
+            """,
+
+    ExpertiseLevel.CONFIRMED: """
+### 1. Introduction et Objectifs
+- Contexte réglementaire du module
+- Objectif de couverture du risque
+
+### 2. Formule de Calcul
+- Formule principale
+- Définition des variables
+- Paramètres clés
+
+### 3. Données et Paramètres
+- Inputs nécessaires
+- Sources de données
+- Fréquence de mise à jour
+
+### 4. Exemples Pratiques
+- Cas d'application concrets
+- Calculs détaillés
+
+### 5. Points d'Attention
+- Difficultés d'implémentation
+- Contrôles à effectuer
+- Interactions avec autres modules
+            """,
+
+    ExpertiseLevel.JUNIOR: """
+### 1. Présentation Générale
+- Qu'est-ce que ce module SCR ?
+- Pourquoi est-il important ?
+
+### 2. Méthode de Calcul Simplifiée
+- Formule de base
+- Étapes principales
+
+### 3. Exemple Simple
+- Cas concret avec chiffres
+- Calcul étape par étape
+
+### 4. Points Clés à Retenir
+- Éléments essentiels
+- Erreurs à éviter
+            """
+}
+
+# Exigences qualité communes et spécifiques à chaque IA
+_BASE_QUALITY_REQUIREMENTS = """
+### Format et Style
+- **Langue** : français professionnel, niveau expert
+- **Formules** : notation mathématique claire (LaTeX si complexe)
+- **Références** : numéros d'articles précis, pas de paraphrase
+- **Structure** : titres courts, paragraphes denses
+
+### Précision Technique
+- **Chiffres exacts** : facteurs officiels, pas d'approximation
+- **Cohérence** : liens entre sections, renvois internes
+- **Sources** : citations directes des textes réglementaires
+- **Exemples** : calculs vérifiables et représentatifs
+        """
+
+_AI_SPECIFIC = {
+    AIProvider.CLAUDE_SONNET_4: """
+### Spécificités Claude
+- **Raisonnement** : étapes logiques détaillées, analyse structurée
+- **Contexte** : utilisation optimale du contexte étendu
+- **Nuances** : gestion des cas particuliers et exceptions
+- **Synthèse** : capacité à condenser l'information essentielle
+            """,
+
+    AIProvider.GPT_4: """
+### Spécificités GPT-4
+- **Précision** : formulations exactes et non ambiguës
+- **Structure** : organisation claire avec numérotation
+- **Exemples** : applications pratiques détaillées
+- **Références** : citations exactes et vérifiables
+            """,
+
+    AIProvider.GEMINI_PRO: """
+### Spécificités Gemini
+- **Créativité** : approches pédagogiques variées
+- **Multiformat** : tableaux, listes, diagrammes textuels
+- **Comparaisons** : mises en perspective avec autres modules
+- **Synthèse** : résumés exécutifs percutants
+            """
+}
+
+
+class _SafeDict(dict):
+    """Dict pour str.format_map : une variable absente reste « {nom} » dans le rendu"""
+
+    def __missing__(self, key: str) -> str:
+        return "{" + key + "}"
+
+
 class PromptTemplate:
     """Template de prompt avec variables dynamiques"""
 
-    def __init__(self, name: str, content: str, variables: List[str]):
+    def __init__(self, name: str, content: str, variables: Optional[List[str]] = None):
+        """
+        Args:
+            name: Nom du template
+            content: Texte avec variables « {nom} »
+            variables: Liste explicite des variables (par défaut, extraite du contenu)
+        """
         self.name = name
         self.content = content
-        self.variables = variables
+        self._variable_set = frozenset(variables if variables is not None else _VARIABLE_RE.findall(content))
+        self.variables = tuple(sorted(self._variable_set))
+
+        # Contenu encodé une fois en UTF-8, découpé en [texte, variable, texte, ...]
+        self._content_bytes = content.encode("utf-8")
+        self._byte_parts = _VARIABLE_BYTES_RE.split(self._content_bytes)
 
     def render(self, **kwargs) -> str:
-        """Rendu du template avec substitution des variables"""
+        """Rendu du template avec substitution des variables (une seule passe)"""
+        try:
+            return self.content.format_map(_SafeDict(kwargs))
+        except (ValueError, IndexError, AttributeError, KeyError):
+            # Accolades non conformes à la syntaxe str.format (template personnalisé)
+            return self._render_by_replace(**kwargs)
+
+    def render_bytes(self, **kwargs) -> bytes:
+        """
+        Rendu directement encodé en UTF-8 (corps de requête HTTP)
+
+        Seules les valeurs des variables sont encodées, le texte du template l'étant
+        déjà ; une variable absente reste « {nom} » comme avec render().
+
+        Args:
+            **kwargs: Valeurs des variables
+
+        Returns:
+            Prompt rendu en UTF-8
+        """
+        rendered = bytearray(self._byte_parts[0])
+        for i in range(1, len(self._byte_parts), 2):
+            name = self._byte_parts[i].decode("ascii")
+            if name in kwargs:
+                rendered += str(kwargs[name]).encode("utf-8")
+            else:
+                rendered += b"{" + self._byte_parts[i] + b"}"
+            rendered += self._byte_parts[i + 1]
+        return bytes(rendered)
+
+    def _render_by_replace(self, **kwargs) -> str:
+        """Rendu par remplacements successifs, tolérant toute accolade"""
         rendered = self.content
         for var in self.variables:
             if var in kwargs:
@@ -25,145 +232,75 @@ class PromptTemplate:
 
     def get_missing_variables(self, **kwargs) -> List[str]:
         """Retourne les variables manquantes"""
-        return [var for var in self.variables if var not in kwargs]
+        return sorted(self._variable_set.difference(kwargs))
 
 
 class PromptTemplateLibrary:
     """Bibliothèque de templates de prompts"""
 
+    # Textes des templates par défaut, lus une seule fois et partagés entre instances
+    _template_texts: Dict[str, str] = {}
+
     def __init__(self):
         self.templates = {}
+        self._resolved = {}  # (AIProvider, ExpertiseLevel) -> PromptTemplate
+        self.version = 0  # Incrémenté à chaque add_template (invalidation des prompts en cache)
         self._load_default_templates()
 
+        # Blocs de structure et de qualité précalculés par (fournisseur, niveau)
+        self._structure = {}
+        self._quality = {}
+        for provider in AIProvider:
+            for level in ExpertiseLevel:
+                self._structure[(provider, level)] = _BASE_STRUCTURE.get(
+                    level, _BASE_STRUCTURE[ExpertiseLevel.CONFIRMED])
+                self._quality[(provider, level)] = _BASE_QUALITY_REQUIREMENTS + _AI_SPECIFIC.get(provider, "")
+
+    @classmethod
+    def _template_text(cls, name: str) -> str:
+        """
+        Texte d'un template par défaut (templates_data/<name>.txt)
+
+        Args:
+            name: Nom du fichier sans extension
+
+        Returns:
+            Contenu du template
+        """
+        text = cls._template_texts.get(name)
+        if text is None:
+            text = (_TEMPLATES_DIR / f"{name}.txt").read_text(encoding="utf-8").rstrip("\n")
+            cls._template_texts[name] = text
+        return text
+
     def _load_default_templates(self):
         """Chargement des templates par défaut"""
 
+        # Les templates placent d'abord le contenu stable pour un couple (IA, niveau),
+        # puis, après DYNAMIC_CONTEXT_MARKER, le contenu propre au module et à la configuration
+
         # Template Claude Sonnet 4 - Expert
         claude_expert = PromptTemplate(
             name="claude_sonnet_4_expert",
-            content="""# CONTEXTE & EXPERTISE
-Tu es un actuaire expert en Solvabilité 2 avec {experience_years}+ années d'expérience dans le calcul des SCR. 
-Ta spécialité : {specialization}. Tu maîtrises parfaitement le Règlement délégué (UE) 2015/35 et ses évolutions récentes.
-
-# MISSION
-Créer une fiche technique professionnelle ultra-complète sur le **calcul du {scr_module_name}** sous Solvabilité 2, 
-destinée à des actuaires confirmés pour usage interne en compagnie d'assurance.
-
-# SOURCES RÉGLEMENTAIRES PRIORITAIRES
-{regulatory_sources}
-
-# CONCEPTS CLÉS À COUVRIR
-{key_concepts}
-
-# STRUCTURE OBLIGATOIRE
-{structure_requirements}
-
-# EXEMPLES CONCRETS REQUIS
-{concrete_examples}
-
-# EXIGENCES DE QUALITÉ CRITIQUE
-{quality_requirements}
-
-**RENDU ATTENDU :** Document de {word_count} mots, niveau référence technique interne, 
-directement utilisable pour implémentation et audit réglementaire.""",
-            variables=["experience_years", "specialization", "scr_module_name",
-                       "regulatory_sources", "key_concepts", "structure_requirements",
-                       "concrete_examples", "quality_requirements", "word_count"]
+            content=self._template_text("claude_expert")
         )
 
         # Template Claude Sonnet 4 - Confirmé
         claude_confirmed = PromptTemplate(
             name="claude_sonnet_4_confirmed",
-            content="""# EXPERT SOLVABILITÉ 2
-Tu es un actuaire spécialisé en Solvabilité 2 avec une expertise approfondie en {scr_module_name}.
-
-# OBJECTIF
-Rédiger un guide technique détaillé sur le **{scr_module_name}** pour des actuaires confirmés.
-
-# SOURCES À UTILISER
-{regulatory_sources}
-
-# POINTS CLÉS À TRAITER
-{key_concepts}
-
-# STRUCTURE DEMANDÉE
-{structure_requirements}
-
-# EXEMPLES PRATIQUES
-{concrete_examples}
-
-# CRITÈRES DE QUALITÉ
-- Formules mathématiques précises
-- Références réglementaires exactes
-- Exemples chiffrés réalistes
-- Niveau technique approprié
-
-**Livrable :** Guide de {word_count} mots maximum, prêt pour utilisation opérationnelle.""",
-            variables=["scr_module_name", "regulatory_sources", "key_concepts",
-                       "structure_requirements", "concrete_examples", "word_count"]
+            content=self._template_text("claude_confirmed")
         )
 
         # Template GPT-4 - Expert
         gpt4_expert = PromptTemplate(
             name="gpt4_expert",
-            content="""You are a Solvency II actuary with deep expertise in {scr_module_name} risk calculations.
-
-OBJECTIVE: Create a comprehensive technical guide for {scr_module_name} SCR calculation.
-
-TARGET AUDIENCE: Expert actuaries in insurance companies.
-
-REGULATORY FRAMEWORK:
-{regulatory_sources}
-
-KEY REQUIREMENTS:
-1. Mathematical formulas with precise notation
-2. Regulatory article references  
-3. Practical examples with calculations
-4. Implementation guidance
-
-STRUCTURE:
-{structure_requirements}
-
-EXAMPLES:
-{concrete_examples}
-
-QUALITY STANDARDS:
-{quality_requirements}
-
-OUTPUT: {word_count} words technical document, ready for professional use.""",
-            variables=["scr_module_name", "regulatory_sources", "structure_requirements",
-                       "concrete_examples", "quality_requirements", "word_count"]
+            content=self._template_text("gpt4_expert")
         )
 
         # Template Gemini Pro - Confirmé
         gemini_confirmed = PromptTemplate(
             name="gemini_pro_confirmed",
-            content="""# Assistant Expert en Réglementation Solvabilité 2
-
-**Spécialisation :** {scr_module_name}
-
-## Mission
-Créer un document technique sur le calcul du {scr_module_name} sous Solvabilité 2.
-
-## Public cible
-Actuaires confirmés en assurance
-
-## Sources réglementaires
-{regulatory_sources}
-
-## Concepts essentiels
-{key_concepts}
-
-## Plan à suivre
-{structure_requirements}
-
-## Exemples attendus
-{concrete_examples}
-
-## Format final
-Document technique de {word_count} mots avec formules, exemples et références.""",
-            variables=["scr_module_name", "regulatory_sources", "key_concepts",
-                       "structure_requirements", "concrete_examples", "word_count"]
+            content=self._template_text("gemini_confirmed")
         )
 
         # Ajout des templates
@@ -173,30 +310,57 @@ Document technique de {word_count} mots avec formules, exemples et références.
         self.templates["gemini_pro_confirmed"] = gemini_confirmed
 
     def get_template(self, ai_provider: AIProvider, expertise_level: ExpertiseLevel) -> PromptTemplate:
-        """Récupération du template approprié"""
-        template_key = f"{ai_provider.value}_{expertise_level.value}"
-
-        if template_key in self.templates:
-            return self.templates[template_key]
-
-        # Fallback vers template générique
-        fallbacks = [
+        """Récupération du template approprié (résolution mémorisée par couple d'enums)"""
+        key = (ai_provider, expertise_level)
+        template = self._resolved.get(key)
+        if template is None:
+            template = self._resolve_template(ai_provider, expertise_level)
+            self._resolved[key] = template
+        return template
+
+    def _resolve_template(self, ai_provider: AIProvider, expertise_level: ExpertiseLevel) -> PromptTemplate:
+        """Template exact, sinon fallback vers template générique"""
+        candidates = (
+            f"{ai_provider.value}_{expertise_level.value}",
             f"{ai_provider.value}_expert",
             f"{ai_provider.value}_confirmed",
             "claude_sonnet_4_expert"
-        ]
+        )
 
-        for fallback in fallbacks:
-            if fallback in self.templates:
-                return self.templates[fallback]
+        for template_key in candidates:
+            template = self.templates.get(template_key)
+            if template is not None:
+                return template
 
         # Si aucun template trouvé, retourner le premier
-        return list(self.templates.values())[0]
+        return next(iter(self.templates.values()))
+
+    def structure_for(self, ai_provider: AIProvider, expertise_level: ExpertiseLevel) -> str:
+        """Exigences de structure du document selon le niveau d'expertise"""
+        return self._structure[(ai_provider, expertise_level)]
+
+    def quality_for(self, ai_provider: AIProvider, expertise_level: ExpertiseLevel) -> str:
+        """Exigences qualité communes et spécifiques à l'IA"""
+        return self._quality[(ai_provider, expertise_level)]
 
     def add_template(self, template: PromptTemplate):
         """Ajout d'un template personnalisé"""
         self.templates[template.name] = template
+        self._resolved.clear()
+        self.version += 1
 
     def list_templates(self) -> List[str]:
         """Liste des templates disponibles"""
-        return list(self.templates.keys())
\ No newline at end of file
+        return list(self.templates.keys())
+
+
+@functools.lru_cache(maxsize=1)
+def get_default_library() -> PromptTemplateLibrary:
+    """
+    Bibliothèque de templates partagée (construite au premier appel)
+
+    Returns:
+        Instance unique de PromptTemplateLibrary ; add_template sur cette instance
+        concerne tous ses utilisateurs
+    """
+    return PromptTemplateLibrary()
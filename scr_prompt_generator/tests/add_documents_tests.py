@@ -4,22 +4,31 @@
 # Fichier: add_documents_test.py
 # ==========================================
 
+import sys
+import sqlite3
+import logging
+import logging.handlers
+
 from src.main import SCRPromptGenerator
 from src.config import DocumentType, SCRModule
 from src.knowledge.models import PromptConfig
 from src.config import AIProvider, ExpertiseLevel
-import tempfile
-import os
-
-
-def test_add_document():
-    """Test d'ajout de document qui fonctionne à coup sûr"""
-
-    print("🧪 TEST D'AJOUT DE DOCUMENT")
-    print("=" * 35)
-
-    # Créer un document HTML réaliste sur le SCR de spread
-    realistic_document = """
+from src.parsers import HTMLParser
+
+# Sortie des tests mise en mémoire tampon et écrite en une fois (à la fin de
+# chaque test, ou immédiatement pour une erreur) au lieu d'un write par ligne
+_log = logging.getLogger(__name__)
+_log.setLevel(logging.INFO)
+_log.propagate = False
+_console = logging.StreamHandler(sys.stdout)
+_console.setFormatter(logging.Formatter('%(message)s'))
+_output = logging.handlers.MemoryHandler(capacity=10000, flushLevel=logging.ERROR, target=_console)
+_log.addHandler(_output)
+
+_REALISTIC_SOURCE = "reglement_2015_35_spread.html"
+
+# Document HTML réaliste sur le SCR de spread
+_REALISTIC_DOCUMENT = """
     <!DOCTYPE html>
     <html lang="fr">
     <head>
@@ -169,127 +178,125 @@ def test_add_document():
     </html>
     """
 
-    try:
-        # Créer un fichier temporaire
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.html', delete=False, encoding='utf-8') as f:
-            f.write(realistic_document)
-            temp_file = f.name
+# Extraction faite une seule fois à l'import : les tests n'analysent plus le HTML
+_REALISTIC_CONTENT = HTMLParser().extract_from_content(_REALISTIC_DOCUMENT, _REALISTIC_SOURCE)
 
-        print(f"📝 Document de test créé: {os.path.basename(temp_file)}")
 
-        # Initialiser le générateur
-        with SCRPromptGenerator() as generator:
+def test_add_document(generator):
+    """Test d'ajout de document qui fonctionne à coup sûr"""
 
-            print("📤 Ajout du document à la base de connaissances...")
-
-            # Ajout du document
-            success = generator.add_document_source(
-                file_path_or_url=temp_file,
-                doc_type=DocumentType.REGULATION_EU,  # Utilisation directe de l'enum
-                scr_modules=[SCRModule.SPREAD, SCRModule.CONCENTRATION],  # Modules pertinents
-                title="Règlement délégué (UE) 2015/35 - Articles 175-181 (SCR Spread)",
-                url="https://eur-lex.europa.eu/legal-content/FR/TXT/?uri=CELEX%3A32015R0035",
-                reliability_score=1.0,  # Maximum pour un règlement officiel
-                language="fr"
+    _log.info("🧪 TEST D'AJOUT DE DOCUMENT")
+    _log.info("=" * 35)
+
+    try:
+        # Initialiser le générateur
+        _log.info("📤 Ajout du document à la base de connaissances...")
+
+        # Ajout du document (contenu déjà extrait, sans nouveau parsing HTML)
+        success = generator.add_document_source(
+            file_path_or_url=_REALISTIC_SOURCE,
+            precomputed_content=_REALISTIC_CONTENT,
+            doc_type=DocumentType.REGULATION_EU,  # Utilisation directe de l'enum
+            scr_modules=[SCRModule.SPREAD, SCRModule.CONCENTRATION],  # Modules pertinents
+            title="Règlement délégué (UE) 2015/35 - Articles 175-181 (SCR Spread)",
+            url="https://eur-lex.europa.eu/legal-content/FR/TXT/?uri=CELEX%3A32015R0035",
+            reliability_score=1.0,  # Maximum pour un règlement officiel
+            language="fr"
+        )
+
+        if success:
+            _log.info("✅ Document ajouté avec succès!")
+
+            # Vérification des statistiques
+            stats = generator.get_statistics()
+            _log.info(f"📊 Statistiques mises à jour:")
+            _log.info(f"   • Total documents: {stats['total_documents']}")
+            _log.info(f"   • Taille base: {stats['system_info']['database_size_mb']:.2f} MB")
+
+            # Vérification des documents par module
+            spread_docs = generator.knowledge_base.get_documents_by_module(SCRModule.SPREAD)
+            _log.info(f"   • Documents SCR Spread: {len(spread_docs)}")
+
+            if spread_docs:
+                doc = spread_docs[0]
+                _log.info(f"   • Dernier document: {doc.title[:50]}...")
+                _log.info(f"   • Articles extraits: {doc.regulatory_articles}")
+
+            # Test de génération de prompt enrichi
+            _log.info(f"\n🤖 Test de génération de prompt enrichi...")
+
+            config = PromptConfig(
+                ai_provider=AIProvider.CLAUDE_SONNET_4,
+                expertise_level=ExpertiseLevel.EXPERT,
+                scr_module=SCRModule.SPREAD,
+                max_length=4000
             )
 
-            if success:
-                print("✅ Document ajouté avec succès!")
-
-                # Vérification des statistiques
-                stats = generator.get_statistics()
-                print(f"📊 Statistiques mises à jour:")
-                print(f"   • Total documents: {stats['total_documents']}")
-                print(f"   • Taille base: {stats['system_info']['database_size_mb']:.2f} MB")
-
-                # Vérification des documents par module
-                spread_docs = generator.knowledge_base.get_documents_by_module(SCRModule.SPREAD)
-                print(f"   • Documents SCR Spread: {len(spread_docs)}")
-
-                if spread_docs:
-                    doc = spread_docs[0]
-                    print(f"   • Dernier document: {doc.title[:50]}...")
-                    print(f"   • Articles extraits: {doc.regulatory_articles}")
-
-                # Test de génération de prompt enrichi
-                print(f"\n🤖 Test de génération de prompt enrichi...")
-
-                config = PromptConfig(
-                    ai_provider=AIProvider.CLAUDE_SONNET_4,
-                    expertise_level=ExpertiseLevel.EXPERT,
-                    scr_module=SCRModule.SPREAD,
-                    max_length=4000
-                )
-
-                result = generator.generate_optimized_prompt(config)
-
-                if result['success']:
-                    print("✅ Prompt enrichi généré avec succès!")
-
-                    metadata = result['metadata']
-                    print(f"📊 Informations du prompt:")
-                    print(f"   • Longueur: {metadata['generation_info']['prompt_length_chars']} caractères")
-                    print(f"   • Mots: {metadata['generation_info']['prompt_length_words']}")
-                    print(f"   • Sources utilisées: {metadata['knowledge_base_stats']['relevant_documents']}")
-                    print(f"   • Score qualité: {result.get('quality_score', 0):.2f}/1.0")
-
-                    # Sauvegarde du prompt enrichi
-                    with open('../prompt_enrichi_avec_reglement.txt', 'w', encoding='utf-8') as f:
-                        f.write(result['prompt'])
-                        f.write(f"\n\n{'=' * 60}\n")
-                        f.write("MÉTADONNÉES DE GÉNÉRATION\n")
-                        f.write(f"{'=' * 60}\n")
-                        f.write(f"Sources utilisées: {metadata['knowledge_base_stats']['relevant_documents']}\n")
-                        f.write(f"Qualité: {result.get('quality_score', 0):.2f}/1.0\n")
-
-                        if result.get('usage_recommendations'):
-                            f.write(f"\nRecommandations d'utilisation:\n")
-                            for rec in result['usage_recommendations']:
-                                f.write(f"- {rec}\n")
-
-                    print("✅ Prompt sauvegardé: prompt_enrichi_avec_reglement.txt")
-
-                    # Aperçu du prompt
-                    print(f"\n📄 APERÇU DU PROMPT ENRICHI (300 premiers caractères):")
-                    print("-" * 60)
-                    print(result['prompt'][:300] + "...")
-                    print("-" * 60)
-
-                    # Vérification de l'enrichissement
-                    if "Article 175" in result['prompt'] or "Article 180" in result['prompt']:
-                        print("🎯 SUCCÈS: Le prompt contient des références aux articles réglementaires!")
-
-                    if "BBB" in result['prompt'] and "duration" in result['prompt'].lower():
-                        print("🎯 SUCCÈS: Le prompt contient des éléments techniques spécifiques!")
-
-                else:
-                    print("❌ Erreur génération prompt enrichi")
+            result = generator.generate_optimized_prompt(config)
+
+            if result['success']:
+                _log.info("✅ Prompt enrichi généré avec succès!")
+
+                metadata = result['metadata']
+                _log.info(f"📊 Informations du prompt:")
+                _log.info(f"   • Longueur: {metadata['generation_info']['prompt_length_chars']} caractères")
+                _log.info(f"   • Mots: {metadata['generation_info']['prompt_length_words']}")
+                _log.info(f"   • Sources utilisées: {metadata['knowledge_base_stats']['relevant_documents']}")
+                _log.info(f"   • Score qualité: {result.get('quality_score', 0):.2f}/1.0")
+
+                # Sauvegarde du prompt enrichi
+                with open('../prompt_enrichi_avec_reglement.txt', 'w', encoding='utf-8') as f:
+                    f.write(result['prompt'])
+                    f.write(f"\n\n{'=' * 60}\n")
+                    f.write("MÉTADONNÉES DE GÉNÉRATION\n")
+                    f.write(f"{'=' * 60}\n")
+                    f.write(f"Sources utilisées: {metadata['knowledge_base_stats']['relevant_documents']}\n")
+                    f.write(f"Qualité: {result.get('quality_score', 0):.2f}/1.0\n")
+
+                    if result.get('usage_recommendations'):
+                        f.write(f"\nRecommandations d'utilisation:\n")
+                        for rec in result['usage_recommendations']:
+                            f.write(f"- {rec}\n")
+
+                _log.info("✅ Prompt sauvegardé: prompt_enrichi_avec_reglement.txt")
+
+                # Aperçu du prompt
+                _log.info(f"\n📄 APERÇU DU PROMPT ENRICHI (300 premiers caractères):")
+                _log.info("-" * 60)
+                _log.info(result['prompt'][:300] + "...")
+                _log.info("-" * 60)
+
+                # Vérification de l'enrichissement
+                if "Article 175" in result['prompt'] or "Article 180" in result['prompt']:
+                    _log.info("🎯 SUCCÈS: Le prompt contient des références aux articles réglementaires!")
+
+                if "BBB" in result['prompt'] and "duration" in result['prompt'].lower():
+                    _log.info("🎯 SUCCÈS: Le prompt contient des éléments techniques spécifiques!")
 
             else:
-                print("❌ Échec de l'ajout du document")
+                _log.info("❌ Erreur génération prompt enrichi")
 
-    except Exception as e:
-        print(f"❌ Erreur: {e}")
-        import traceback
-        traceback.print_exc()
+        else:
+            _log.info("❌ Échec de l'ajout du document")
+
+    except (OSError, KeyError, ValueError, sqlite3.Error) as e:
+        # Échecs attendus : sauvegarde du prompt, métadonnées incomplètes, base
+        _log.error(f"❌ Erreur: {e}")
 
     finally:
-        # Nettoyage du fichier temporaire
-        if 'temp_file' in locals() and os.path.exists(temp_file):
-            os.unlink(temp_file)
-            print("🧹 Fichier temporaire nettoyé")
+        _output.flush()
 
 
-def test_multiple_documents():
+def test_multiple_documents(generator):
     """Test d'ajout de plusieurs documents différents"""
 
-    print(f"\n🧪 TEST D'AJOUT DE PLUSIEURS DOCUMENTS")
-    print("=" * 45)
+    _log.info(f"\n🧪 TEST D'AJOUT DE PLUSIEURS DOCUMENTS")
+    _log.info("=" * 45)
 
-    # Documents de test avec différents contenus
-    documents_test = [
-        {
-            'content': '''
+    # Documents de test avec différents contenus, une liste par champ
+    documents_test = {
+        'content': [
+            '''
             <html><head><title>EIOPA Guidelines Spread Risk</title></head>
             <body>
                 <h1>Guidelines on the calibration of spread risk</h1>
@@ -298,13 +305,7 @@ def test_multiple_documents():
                 <p>Special treatment for government bonds: exemption for EU member state bonds in local currency.</p>
             </body></html>
             ''',
-            'doc_type': DocumentType.EIOPA_GUIDELINES,
-            'modules': [SCRModule.SPREAD],
-            'title': 'EIOPA Guidelines on Spread Risk Calibration',
-            'reliability': 0.95
-        },
-        {
-            'content': '''
+            '''
             <html><head><title>SCR Equity Risk</title></head>
             <body>
                 <h1>SCR Equity - Type I and Type II</h1>
@@ -314,60 +315,58 @@ def test_multiple_documents():
                 <p>Long Term Equity Investment (LTEI): reduced capital charge under specific conditions</p>
             </body></html>
             ''',
-            'doc_type': DocumentType.TECHNICAL_STANDARDS,
-            'modules': [SCRModule.EQUITY],
-            'title': 'Technical Standards on Equity Risk',
-            'reliability': 0.9
-        }
-    ]
-
-    with SCRPromptGenerator() as generator:
-
-        for i, doc_info in enumerate(documents_test, 1):
-            print(f"\n📄 Ajout document {i}/{len(documents_test)}: {doc_info['title']}")
-
-            try:
-                # Créer fichier temporaire
-                with tempfile.NamedTemporaryFile(mode='w', suffix='.html', delete=False, encoding='utf-8') as f:
-                    f.write(doc_info['content'])
-                    temp_file = f.name
-
-                # Ajouter à la base
-                success = generator.add_document_source(
-                    file_path_or_url=temp_file,
-                    doc_type=doc_info['doc_type'],
-                    scr_modules=doc_info['modules'],
-                    title=doc_info['title'],
-                    reliability_score=doc_info['reliability']
-                )
-
-                if success:
-                    print(f"   ✅ Ajouté avec succès")
-                else:
-                    print(f"   ❌ Échec ajout")
-
-                # Nettoyage
-                os.unlink(temp_file)
-
-            except Exception as e:
-                print(f"   ❌ Erreur: {e}")
+        ],
+        'doc_type': [DocumentType.EIOPA_GUIDELINES, DocumentType.TECHNICAL_STANDARDS],
+        'scr_modules': [[SCRModule.SPREAD], [SCRModule.EQUITY]],
+        'title': ['EIOPA Guidelines on Spread Risk Calibration', 'Technical Standards on Equity Risk'],
+        'reliability_score': [0.95, 0.9]
+    }
+    titles = documents_test['title']
+    documents_test['file_path_or_url'] = [f"document_test_{i}.html" for i in range(1, len(titles) + 1)]
 
+    try:
+        for i, title in enumerate(titles, 1):
+            _log.info(f"\n📄 Préparation document {i}/{len(titles)}: {title}")
+
+        # Ajouter à la base en un seul appel, colonne par colonne
+        results = generator.add_document_sources(**documents_test)
+
+        for title, success in zip(titles, results):
+            if success:
+                _log.info(f"   ✅ Ajouté avec succès: {title}")
+            else:
+                _log.info(f"   ❌ Échec ajout: {title}")
+
+    except (ValueError, sqlite3.Error) as e:
+        _log.error(f"   ❌ Erreur: {e}")
+
+    try:
         # Statistiques finales
         stats = generator.get_statistics()
-        print(f"\n📊 STATISTIQUES FINALES:")
-        print(f"   • Total documents: {stats['total_documents']}")
-        print(f"   • Taille base: {stats['system_info']['database_size_mb']:.2f} MB")
+        _log.info(f"\n📊 STATISTIQUES FINALES:")
+        _log.info(f"   • Total documents: {stats['total_documents']}")
+        _log.info(f"   • Taille base: {stats['system_info']['database_size_mb']:.2f} MB")
+
+    finally:
+        _output.flush()
 
 
 if __name__ == "__main__":
     print("🚀 TESTS D'AJOUT DE DOCUMENTS EXPERTS SCR")
     print("=" * 50)
 
-    # Test principal
-    test_add_document()
+    try:
+        with SCRPromptGenerator() as generator:
+            # Test principal
+            test_add_document(generator)
 
-    # Test multiple
-    test_multiple_documents()
+            # Test multiple
+            test_multiple_documents(generator)
+
+    except Exception as e:
+        # Erreur inattendue : trace formatée une seule fois, dans le flux des tests
+        _log.exception(f"❌ Erreur inattendue: {e}")
+        sys.exit(1)
 
     print(f"\n🎉 TESTS TERMINÉS!")
     print(f"💡 Maintenant vous pouvez:")
@@ -23,32 +23,40 @@ with SCRPromptGenerator() as generator:
     print("📚 AJOUT DE VOS DOCUMENTS EXPERTS")
     print("=" * 40)
     
+    # Préparation de la liste des documents disponibles
+    import os
+    specs = []
+    titles = []
     for i, doc in enumerate(documents, 1):
         print(f"\n📄 [{i}/{len(documents)}] {doc['title']}")
         
         # Vérifier que le fichier existe
-        import os
         if not doc['file'].startswith('http') and not os.path.exists(doc['file']):
             print(f"   ⚠️ Fichier non trouvé: {doc['file']}")
             print(f"   💡 Créez d'abord le répertoire et placez-y vos PDFs")
             continue
         
-        try:
-            success = generator.add_document_source(
-                file_path_or_url=doc['file'],
-                doc_type=doc['type'],
-                scr_modules=doc['modules'],
-                title=doc['title'],
-                reliability_score=doc['reliability']
-            )
-            
+        specs.append({
+            'file_path_or_url': doc['file'],
+            'doc_type': doc['type'],
+            'scr_modules': doc['modules'],
+            'title': doc['title'],
+            'reliability_score': doc['reliability']
+        })
+        titles.append(doc['title'])
+    
+    # Ajout groupé (une transaction pour l'ensemble des documents)
+    try:
+        results = generator.add_document_sources(specs)
+        
+        for title, success in zip(titles, results):
             if success:
-                print(f"   ✅ Ajouté avec succès!")
+                print(f"   ✅ Ajouté avec succès: {title}")
             else:
-                print(f"   ❌ Échec ajout")
+                print(f"   ❌ Échec ajout: {title}")
                 
-        except Exception as e:
-            print(f"   ❌ Erreur: {e}")
+    except Exception as e:
+        print(f"   ❌ Erreur: {e}")
     
     # Statistiques finales
     stats = generator.get_statistics()
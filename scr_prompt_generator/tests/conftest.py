@@ -0,0 +1,27 @@
+# ==========================================
+# FIXTURES PARTAGÉES DES TESTS
+# Fichier: conftest.py
+# ==========================================
+
+import pytest
+
+from src.main import SCRPromptGenerator
+
+# Scripts interactifs (saisie clavier) pilotés par interactive_full_test, pas des tests pytest
+collect_ignore = ["interactive_test.py"]
+
+
+@pytest.fixture(scope="session")
+def _session_generator(tmp_path_factory):
+    """Générateur unique pour toute la session, sur une base temporaire"""
+    data_dir = tmp_path_factory.mktemp("scr_data")
+
+    with SCRPromptGenerator(data_dir=str(data_dir), db_path=str(data_dir / "scr_knowledge.db")) as generator:
+        yield generator
+
+
+@pytest.fixture
+def generator(_session_generator):
+    """Générateur partagé, base de connaissances vidée avant chaque test"""
+    _session_generator.knowledge_base.clear()
+    return _session_generator
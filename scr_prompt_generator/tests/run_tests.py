@@ -133,6 +133,7 @@ def test_with_sample_document():
     </html>
     """
 
+    temp_file = None
     try:
         # Création fichier temporaire
         with tempfile.NamedTemporaryFile(mode='w', suffix='.html', delete=False, encoding='utf-8') as f:
@@ -191,8 +192,11 @@ def test_with_sample_document():
         print(f"❌ Erreur: {e}")
     finally:
         # Nettoyage
-        if 'temp_file' in locals() and os.path.exists(temp_file):
-            os.unlink(temp_file)
+        if temp_file:
+            try:
+                os.unlink(temp_file)
+            except FileNotFoundError:
+                pass
 
 
 def interactive_test():
@@ -37,35 +37,49 @@ def test_database():
                 content_hash="abc123"
             )
 
-            success = kb.add_document(doc)
-            print(f"✅ Document ajouté: {success}")
-
-            # Test récupération
-            retrieved_doc = kb.get_document_by_id("test_doc_001")
-            print(f"✅ Document récupéré: {retrieved_doc.title if retrieved_doc else 'Non trouvé'}")
-
-            # Test recherche par module
-            spread_docs = kb.get_documents_by_module(SCRModule.SPREAD)
-            print(f"✅ Documents spread trouvés: {len(spread_docs)}")
-
-            # Test ajout concept
-            concept = SCRConcept(
-                concept_name="Facteur de stress spread",
-                scr_module=SCRModule.SPREAD,
-                definition="Facteur appliqué selon la notation et la duration",
-                formula="Stress_i = Duration_i × Facteur_notation_i",
-                regulatory_article="180",
-                examples=["BBB 5 ans: 8.5%", "AAA 10 ans: 4.2%"]
-            )
-
-            concept_id = kb.add_scr_concept(concept)
-            print(f"✅ Concept ajouté avec ID: {concept_id}")
+            # Écritures du test regroupées en une transaction
+            with kb.batch():
+                success = kb.add_document(doc)
+                print(f"✅ Document ajouté: {success}")
+
+                # Test récupération
+                retrieved_doc = kb.get_document_by_id("test_doc_001")
+                print(f"✅ Document récupéré: {retrieved_doc.title if retrieved_doc else 'Non trouvé'}")
+
+                # Test recherche par module
+                spread_docs = kb.get_documents_by_module(SCRModule.SPREAD)
+                print(f"✅ Documents spread trouvés: {len(spread_docs)}")
+
+                # Test recherche insensible à la casse
+                found = kb.search(query="DOCUMENT DE TEST")
+                print(f"✅ Recherche sans casse: {len(found)}")
+
+                # Test ajout concept
+                concept = SCRConcept(
+                    concept_name="Facteur de stress spread",
+                    scr_module=SCRModule.SPREAD,
+                    definition="Facteur appliqué selon la notation et la duration",
+                    formula="Stress_i = Duration_i × Facteur_notation_i",
+                    regulatory_article="180",
+                    examples=["BBB 5 ans: 8.5%", "AAA 10 ans: 4.2%"]
+                )
+
+                concept_id = kb.add_scr_concept(concept)
+                print(f"✅ Concept ajouté avec ID: {concept_id}")
 
             # Test statistiques
             stats = kb.get_statistics()
             print(f"✅ Statistiques: {stats['total_documents']} documents")
 
-            print("\n🎉 TOUS LES TESTS PASSÉS!")
+        # Test base en mémoire : chargée depuis le fichier, recopiée à la fermeture
+        with SCRKnowledgeBase(test_db, in_memory=True) as kb:
+            print(f"✅ Base en mémoire chargée: {kb.get_document_by_id('test_doc_001') is not None}")
+            kb.clear()
+
+        with SCRKnowledgeBase(test_db) as kb:
+            print(f"✅ Suppression recopiée sur disque: {kb.get_statistics()['total_documents'] == 0}")
+
+        print("\n🎉 TOUS LES TESTS PASSÉS!")
 
     except Exception as e:
         print(f"❌ ERREUR: {e}")
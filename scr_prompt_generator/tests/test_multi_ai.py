@@ -3,44 +3,52 @@
 # Fichier: test_multi_ai.py
 # ==========================================
 
-def test_multi_ai_comparison():
-    """Test comparatif entre différentes IA"""
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from src.knowledge.models import PromptConfig
+from src.config import AIProvider, ExpertiseLevel, SCRModule
+
+# Configurations comparées, construites une seule fois à l'import
+_PROMPT_CONFIGS = [
+    (PromptConfig(ai_provider=ai_provider, expertise_level=expertise_level,
+                  scr_module=SCRModule.SPREAD, max_length=2500), description)
+    for ai_provider, expertise_level, description in (
+        (AIProvider.CLAUDE_SONNET_4, ExpertiseLevel.EXPERT, "Claude Sonnet 4 Expert"),
+        (AIProvider.GPT_4, ExpertiseLevel.EXPERT, "GPT-4 Expert"),
+        (AIProvider.CLAUDE_SONNET_4, ExpertiseLevel.CONFIRMED, "Claude Sonnet 4 Confirmé"),
+        (AIProvider.GEMINI_PRO, ExpertiseLevel.CONFIRMED, "Gemini Pro Confirmé"),
+    )
+]
+
+
+def _timed_generation(generator, config):
+    """Génération d'un prompt et durée mesurée dans le thread qui l'exécute"""
+    start_time = time.perf_counter()
+    result = generator.generate_optimized_prompt(config)
+    return result, time.perf_counter() - start_time
+
+
+def test_multi_ai_comparison(generator):
+    """Test comparatif entre différentes IA (générateur partagé fourni par conftest)"""
     print("🤖 TEST COMPARATIF MULTI-IA")
     print("=" * 35)
 
     try:
-        from src.main import SCRPromptGenerator
-        from src.knowledge.models import PromptConfig
-        from src.config import AIProvider, ExpertiseLevel, SCRModule
-
-        generator = SCRPromptGenerator()
-
-        # Configurations à tester
-        test_configs = [
-            (AIProvider.CLAUDE_SONNET_4, ExpertiseLevel.EXPERT, "Claude Sonnet 4 Expert"),
-            (AIProvider.GPT_4, ExpertiseLevel.EXPERT, "GPT-4 Expert"),
-            (AIProvider.CLAUDE_SONNET_4, ExpertiseLevel.CONFIRMED, "Claude Sonnet 4 Confirmé"),
-            (AIProvider.GEMINI_PRO, ExpertiseLevel.CONFIRMED, "Gemini Pro Confirmé"),
-        ]
+        # Générations en parallèle, chacune chronométrée dans son propre thread
+        with ThreadPoolExecutor(max_workers=len(_PROMPT_CONFIGS)) as executor:
+            futures = {
+                executor.submit(_timed_generation, generator, config): description
+                for config, description in _PROMPT_CONFIGS
+            }
+            outcomes = {futures[future]: future.result() for future in as_completed(futures)}
 
         results = {}
 
-        for ai_provider, expertise_level, description in test_configs:
+        # Affichage dans l'ordre des configurations
+        for _, description in _PROMPT_CONFIGS:
             print(f"\n🧪 Test: {description}")
-
-            config = PromptConfig(
-                ai_provider=ai_provider,
-                expertise_level=expertise_level,
-                scr_module=SCRModule.SPREAD,
-                max_length=2500
-            )
-
-            import time
-            start_time = time.time()
-
-            result = generator.generate_optimized_prompt(config)
-
-            generation_time = time.time() - start_time
+            result, generation_time = outcomes[description]
 
             if result['success']:
                 results[description] = {
@@ -95,7 +103,6 @@ def test_multi_ai_comparison():
             print(f"\n{config2} (200 premiers caractères):")
             print(f"'{results[config2]['prompt'][:200]}...'")
 
-        generator.close()
         print(f"\n🎉 TEST COMPARATIF TERMINÉ!")
         return True
 
@@ -8,6 +8,7 @@ def test_parsers():
     import os
     import tempfile
     from src.parsers import PDFParser, HTMLParser, create_parser
+    from src.config import Config
 
     print("🧪 TEST DES PARSERS DE DOCUMENTS")
     print("=" * 45)
@@ -36,6 +37,7 @@ def test_parsers():
     </html>
     """
 
+    temp_html = None
     try:
         with tempfile.NamedTemporaryFile(mode='w', suffix='.html', delete=False, encoding='utf-8') as f:
             f.write(html_content)
@@ -56,11 +58,29 @@ def test_parsers():
         keywords = html_parser.extract_scr_keywords(result['text_content'])
         print(f"✅ HTML - Mots-clés SCR: {keywords[:5]}")
 
+        # Test arbre filtré (SoupStrainer)
+        filtered = HTMLParser(content_only=True).extract_content(temp_html)
+        print(f"✅ HTML content_only - Titre: {filtered['metadata']['title']}, "
+              f"Tableaux: {filtered['statistics']['table_count']}")
+
+        # Test lecture en flux (seuil abaissé pour ce petit fichier)
+        threshold = Config.HTML_STREAMING_THRESHOLD_MB
+        Config.HTML_STREAMING_THRESHOLD_MB = 0
+        try:
+            streamed = HTMLParser().extract_content(temp_html)
+        finally:
+            Config.HTML_STREAMING_THRESHOLD_MB = threshold
+        print(f"✅ HTML flux - Texte identique: {streamed['text_content'] == result['text_content']}, "
+              f"Tableaux identiques: {streamed['tables'] == result['tables']}")
+
     except Exception as e:
         print(f"❌ Erreur HTML Parser: {e}")
     finally:
-        if 'temp_html' in locals():
-            os.unlink(temp_html)
+        if temp_html:
+            try:
+                os.unlink(temp_html)
+            except FileNotFoundError:
+                pass
 
     # Test factory
     print(f"\n2. Test Factory")
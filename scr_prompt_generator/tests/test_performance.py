@@ -3,20 +3,25 @@
 # Fichier: test_performance.py
 # ==========================================
 
-def test_performance():
-    """Test de performance et de charge"""
+import os
+import time
+import statistics
+
+try:
+    import psutil  # Optionnel : mesure mémoire (import hors des sections chronométrées)
+except ImportError:
+    psutil = None
+
+
+def test_performance(generator):
+    """Test de performance et de charge (générateur partagé fourni par conftest)"""
     print("⚡ TEST DE PERFORMANCE")
     print("=" * 30)
 
     try:
-        import time
-        import statistics
-        from src.main import SCRPromptGenerator
         from src.knowledge.models import PromptConfig
         from src.config import AIProvider, ExpertiseLevel, SCRModule
 
-        generator = SCRPromptGenerator()
-
         # Configuration de test
         config = PromptConfig(
             ai_provider=AIProvider.CLAUDE_SONNET_4,
@@ -25,6 +30,9 @@ def test_performance():
             max_length=3000
         )
 
+        # Préchauffage : exclut des mesures les coûts du premier appel (imports, ouverture DB)
+        generator.generate_optimized_prompt(config)
+
         # Test de génération multiple
         print("🔄 Test génération multiple...")
         times = []
@@ -33,11 +41,9 @@ def test_performance():
         for i in range(5):
             print(f"   Génération {i + 1}/5...")
 
-            start_time = time.time()
+            start_ns = time.perf_counter_ns()
             result = generator.generate_optimized_prompt(config)
-            end_time = time.time()
-
-            generation_time = end_time - start_time
+            generation_time = (time.perf_counter_ns() - start_ns) / 1e9
             times.append(generation_time)
 
             if result['success']:
@@ -72,21 +78,38 @@ def test_performance():
         for module in modules_test:
             config.scr_module = module
 
-            start_time = time.time()
+            start_ns = time.perf_counter_ns()
             result = generator.generate_optimized_prompt(config)
-            end_time = time.time()
-
-            module_times[module.value] = end_time - start_time
+            module_times[module.value] = (time.perf_counter_ns() - start_ns) / 1e9
             print(f"   {module.value}: {module_times[module.value]:.3f}s")
 
+        # Test génération groupée (lectures de la base mutualisées)
+        print(f"\n📦 Test génération groupée...")
+        batch_configs = [
+            PromptConfig(
+                ai_provider=config.ai_provider,
+                expertise_level=config.expertise_level,
+                scr_module=module,
+                max_length=config.max_length
+            )
+            for module in modules_test
+        ]
+
+        start_ns = time.perf_counter_ns()
+        batch_results = generator.generate_optimized_prompts_batch(batch_configs)
+        batch_time = (time.perf_counter_ns() - start_ns) / 1e9
+
+        batch_ok = sum(1 for result in batch_results if result['success'])
+        print(f"   {batch_ok}/{len(batch_configs)} prompts en {batch_time:.3f}s")
+
         # Test mémoire (basique)
         print(f"\n💾 Test utilisation mémoire...")
-        import psutil
-        import os
-
-        process = psutil.Process(os.getpid())
-        memory_mb = process.memory_info().rss / 1024 / 1024
-        print(f"   Mémoire utilisée: {memory_mb:.1f} MB")
+        if psutil is not None:
+            process = psutil.Process(os.getpid())
+            memory_mb = process.memory_info().rss / 1024 / 1024
+            print(f"   Mémoire utilisée: {memory_mb:.1f} MB")
+        else:
+            print("   psutil non installé, mesure ignorée")
 
         # Test base de données
         print(f"\n🗄️ Test base de données...")
@@ -95,8 +118,6 @@ def test_performance():
         print(f"   Taille DB: {db_size:.2f} MB")
         print(f"   Documents: {stats['total_documents']}")
 
-        generator.close()
-
         # Évaluation finale
         avg_time = statistics.mean(times) if times else 0
         if avg_time < 1.0:
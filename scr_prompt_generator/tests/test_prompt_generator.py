@@ -10,6 +10,7 @@ def test_prompt_generator():
     from src.knowledge.database import SCRKnowledgeBase
     from src.knowledge.models import PromptConfig, DocumentSource, SCRConcept
     from src.prompts.generator import PromptEngineer
+    from src.prompts.templates import PromptTemplate, PromptTemplateLibrary
     from src.config import AIProvider, ExpertiseLevel, SCRModule, DocumentType
     from datetime import date
 
@@ -90,6 +91,34 @@ def test_prompt_generator():
             prompt3 = prompt_engineer.generate_prompt(config3)
             print(f"✅ Prompt généré: {len(prompt3)} caractères")
 
+            # Test 4: Blocs préfixe statique / contexte dynamique
+            print("\n4. Test blocs de prompt (cache côté API)")
+            blocks = prompt_engineer.generate_prompt_blocks(config)
+            print(f"✅ Blocs reconstituent le prompt: {''.join(b['text'] for b in blocks) == prompt}")
+            print(f"✅ Point d'arrêt cache_control: {blocks[0].get('cache_control') == {'type': 'ephemeral'}}")
+
+            other_module = PromptConfig(
+                ai_provider=AIProvider.CLAUDE_SONNET_4,
+                expertise_level=ExpertiseLevel.EXPERT,
+                scr_module=SCRModule.EQUITY,
+                max_length=2000
+            )
+            other_blocks = prompt_engineer.generate_prompt_blocks(other_module)
+            print(f"✅ Préfixe identique entre modules: {other_blocks[0]['text'] == blocks[0]['text']}")
+
+            # Test 5: Rendu encodé UTF-8
+            template = prompt_engineer.template_library.get_template(config.ai_provider, config.expertise_level)
+            context = {'scr_module_name': 'SCR de spread', 'word_count': '3000'}
+            print(f"✅ render_bytes == render().encode(): "
+                  f"{template.render_bytes(**context) == template.render(**context).encode('utf-8')}")
+
+            # Test 6: Template personnalisé ajouté après un premier rendu (cache invalidé)
+            custom_engineer = PromptEngineer(kb, PromptTemplateLibrary())
+            custom_engineer.generate_prompt(config3)
+            custom_engineer.template_library.add_template(PromptTemplate('gemini-pro_junior', 'CUSTOM {scr_module_name}'))
+            print(f"✅ Template ajouté pris en compte: "
+                  f"{custom_engineer.generate_prompt(config3).startswith('CUSTOM')}")
+
             # Affichage d'un exemple de prompt (tronqué)
             print(f"\n📄 EXEMPLE DE PROMPT (Claude Expert - 500 premiers caractères):")
             print("-" * 60)
@@ -3,15 +3,15 @@
 # Fichier: test_with_document.py
 # ==========================================
 
-def test_with_real_document():
-    """Test avec ajout d'un document HTML réaliste"""
+from src.knowledge.models import PromptConfig
+from src.config import AIProvider, ExpertiseLevel, SCRModule, DocumentType
+
+
+def test_with_real_document(generator):
+    """Test avec ajout d'un document HTML réaliste (générateur partagé fourni par conftest)"""
     print("📄 TEST AVEC DOCUMENT RÉEL")
     print("=" * 40)
 
-    import tempfile
-    import os
-    from pathlib import Path
-
     # Création d'un document HTML réaliste
     realistic_html = """
     <!DOCTYPE html>
@@ -75,24 +75,15 @@ def test_with_real_document():
     """
 
     try:
-        # Sauvegarde du document temporaire
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.html', delete=False, encoding='utf-8') as f:
-            f.write(realistic_html)
-            temp_file = f.name
-
-        print(f"📝 Document créé: {Path(temp_file).name}")
-
-        # Initialisation du générateur
-        from src.main import SCRPromptGenerator
-        from src.knowledge.models import PromptConfig
-        from src.config import AIProvider, ExpertiseLevel, SCRModule, DocumentType
-
-        generator = SCRPromptGenerator()
+        # Document passé en mémoire : ni écriture ni relecture d'un fichier temporaire
+        source_name = "guide_scr_spread_test.html"
+        print(f"📝 Document créé: {source_name}")
 
         # Ajout du document
         print("\n📤 Ajout du document...")
         success = generator.add_document_source(
-            file_path_or_url=temp_file,
+            file_path_or_url=source_name,
+            content=realistic_html,
             doc_type=DocumentType.EIOPA_GUIDELINES,
             scr_modules=[SCRModule.SPREAD],
             title="Guide SCR Spread - Test",
@@ -139,27 +130,23 @@ def test_with_real_document():
 
         # Vérifications de qualité
         print(f"\n✅ VÉRIFICATIONS DE QUALITÉ:")
+        prompt = result['prompt']
+        prompt_lower = prompt.lower()  # Une seule copie en minuscules pour toutes les vérifications
         checks = [
-            ("Mention Article 180", "180" in result['prompt']),
-            ("Mention facteurs de stress",
-             "facteur" in result['prompt'].lower() and "stress" in result['prompt'].lower()),
-            ("Mention duration", "duration" in result['prompt'].lower()),
-            ("Mention BBB", "BBB" in result['prompt']),
-            ("Structure professionnelle", "SYNTHÈSE" in result['prompt'] or "synthèse" in result['prompt']),
+            ("Mention Article 180", "180" in prompt),
+            ("Mention facteurs de stress", "facteur" in prompt_lower and "stress" in prompt_lower),
+            ("Mention duration", "duration" in prompt_lower),
+            ("Mention BBB", "BBB" in prompt),
+            ("Structure professionnelle", "SYNTHÈSE" in prompt or "synthèse" in prompt),
         ]
 
         for check_name, passed in checks:
             status = "✅" if passed else "⚠️"
             print(f"   {status} {check_name}")
 
-        generator.close()
         print(f"\n🎉 TEST AVEC DOCUMENT RÉUSSI!")
         return True
 
     except Exception as e:
         print(f"\n❌ ERREUR: {e}")
-        return False
-    finally:
-        # Nettoyage
-        if 'temp_file' in locals() and os.path.exists(temp_file):
-            os.unlink(temp_file)
\ No newline at end of file
+        return False
\ No newline at end of file
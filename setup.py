@@ -22,6 +22,8 @@ scr_prompt_generator/
 │   ├── prompts/
 │   │   ├── __init__.py
 │   │   ├── templates.py
+│   │   ├── templates_data/
+│   │   ├── _defaults/
 │   │   └── generator.py
 │   └── main.py
 ├── data/
@@ -44,9 +46,10 @@ pathlib  # Built-in with Python
 logging  # Built-in with Python
 
 # Document processing
-PyPDF2>=3.0.0
+pypdfium2>=4.0.0
 pdfplumber>=0.7.0
 beautifulsoup4>=4.11.0
+lxml>=4.9.0
 requests>=2.28.0
 
 # Configuration and CLI
@@ -58,9 +61,9 @@ python-magic>=0.4.27  # For file type detection
 """
 
 # 3. Script de setup automatique
-import os
 import subprocess
 import sys
+from pathlib import Path
 
 
 def create_project_structure():
@@ -74,13 +77,15 @@ def create_project_structure():
         "scr_prompt_generator/src/parsers",
         "scr_prompt_generator/src/knowledge",
         "scr_prompt_generator/src/prompts",
+        "scr_prompt_generator/src/prompts/templates_data",
+        "scr_prompt_generator/src/prompts/_defaults",
         "scr_prompt_generator/data",
         "scr_prompt_generator/data/documents",
         "scr_prompt_generator/tests"
     ]
 
     for directory in directories:
-        os.makedirs(directory, exist_ok=True)
+        Path(directory).mkdir(parents=True, exist_ok=True)
         print(f"✅ Créé: {directory}/")
 
     # Fichiers __init__.py
@@ -90,17 +95,17 @@ def create_project_structure():
         "scr_prompt_generator/src/parsers/__init__.py",
         "scr_prompt_generator/src/knowledge/__init__.py",
         "scr_prompt_generator/src/prompts/__init__.py",
+        "scr_prompt_generator/src/prompts/_defaults/__init__.py",
         "scr_prompt_generator/tests/__init__.py"
     ]
 
+    init_content = '"""Package initialization"""'
     for init_file in init_files:
-        with open(init_file, 'w') as f:
-            f.write('"""Package initialization"""')
+        Path(init_file).write_text(init_content)
         print(f"✅ Créé: {init_file}")
 
     # requirements.txt
-    with open("requirements.txt", "w") as f:
-        f.write(requirements_content.strip())
+    Path("requirements.txt").write_text(requirements_content.strip())
     print("✅ Créé: requirements.txt")
 
     print("\n🎉 Structure du projet créée avec succès!")